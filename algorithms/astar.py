@@ -5,67 +5,195 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
-import heapq
-
 from search_algorithm import SearchAlgorithm
-from node import Node
+from node import NodePool
+from priority_queue import BucketQueue, HeapQueue, IndexedPriorityQueue
+from budget import BudgetBreach
+from checkpoint import pack_nodes, unpack_nodes
 
 class TreeAStar(SearchAlgorithm):
     """
     Implementa el algoritmo A* para búsqueda en árbol.
+
+    La frontera es una `BucketQueue` mientras todos los f(n) sean
+    enteros (costes y heurística enteros, p. ej. Pacman con Manhattan), y
+    pasa a un heap binario en cuanto aparece un f(n) no entero (p. ej. con
+    `EuclideanHeuristic`). `bucket_fringe=False` fuerza siempre el heap y
+    `bucket_fringe=True` fuerza siempre los buckets. El orden de expansión
+    es el mismo en los tres casos. `indexed_fringe=True` solo existe en
+    `GraphAStar`: en árbol fusionaría nodos distintos con el mismo estado.
+
+    Con `node_pool=True` los nodos generados se guardan en un `NodePool`
+    (arrays tipados) en lugar de un objeto `Node` por nodo, y solo se
+    construye la cadena de `Node` de la solución. No está disponible en
+    `GraphAStar`.
+
+    `progress` es un `ProgressReporter` opcional que recibe eventos de
+    progreso (expandidos, tamaño de la frontera, f del nodo expandido,
+    nodos/s y RSS) durante la búsqueda.
+
+    `budget` es un `SearchBudget` opcional (tiempo, nodos expandidos,
+    tamaño de la frontera y memoria). Si se supera, `search` devuelve un
+    `BudgetExceeded` con el mayor f expandido y las estadísticas.
+
+    `checkpoint` es un `Checkpointer` opcional: la frontera, los contadores
+    y las cadenas de padres se guardan periódicamente en disco y, si al
+    llamar a `search` ya existe el fichero, la búsqueda continúa desde ahí
+    con el mismo resultado y la misma numeración de `expanded_order`. No
+    está disponible en `GraphAStar`.
     """
 
-    def __init__(self, problem, heuristic=None):
+    _graph_search = False
+
+    def __init__(self, problem, heuristic=None, indexed_fringe=False, bucket_fringe=None,
+                 node_pool=False, progress=None, budget=None, checkpoint=None):
         super().__init__(problem)
         self.heuristic = heuristic or problem.heuristic
         if not self.heuristic:
             raise ValueError("La búsqueda A* requiere una función heurística.")
-        
+        if indexed_fringe and not self._graph_search:
+            raise ValueError("indexed_fringe=True solo está disponible en GraphAStar.")
+
+        self.indexed_fringe = indexed_fringe
+        self.bucket_fringe = bucket_fringe
+        self.node_pool = node_pool
+        self.progress = progress
+        self.budget = budget
+        self.checkpoint = checkpoint
         self.expanded_nodes = 0
-        self._generated_count = 0 
+        self._generated_count = 0
+        self.max_fringe_size = 0  # tamaño máximo alcanzado por la frontera
 
     def f(self, node):
         """f(n) = g(n) + h(n)"""
         return node.path_cost + self.heuristic(node.state)
 
+    def _new_fringe(self, f_root):
+        """Crea la frontera (heap o buckets) según `bucket_fringe`."""
+        if self.bucket_fringe is False:
+            return self.new_fringe(HeapQueue)
+        if self.bucket_fringe or type(f_root) is int:
+            return self.new_fringe(BucketQueue)
+        return self.new_fringe(HeapQueue)
+
+    def _push(self, fringe, f_value, node):
+        """
+        Inserta `node` con prioridad (f, contador) y devuelve la frontera.
+
+        En modo automático, el primer f(n) no entero convierte la
+        `BucketQueue` en un heap con las mismas entradas.
+        """
+        if type(f_value) is not int and self.bucket_fringe is None \
+                and isinstance(fringe, BucketQueue):
+            heap = self.new_fringe(HeapQueue, fringe)
+            heap.max_size = max(heap.max_size, fringe.max_size)
+            fringe = heap
+        fringe.push(f_value, self._generated_count, node)
+        self._generated_count += 1
+        return fringe
+
+    def _snapshot(self, kind, fringe, pool=None):
+        """Estado de la búsqueda que guarda el `Checkpointer`."""
+        entries = list(fringe)
+        snapshot = {
+            "algorithm": type(self).__name__,
+            "kind": kind,
+            "expanded_nodes": self.expanded_nodes,
+            "generated_count": self._generated_count,
+            "fringe_type": type(fringe).__name__,
+            "max_size": fringe.max_size,
+            "priorities": [entry[0] for entry in entries],
+            "counts": [entry[1] for entry in entries],
+        }
+        if pool is None:
+            snapshot["nodes"], snapshot["items"] = pack_nodes([entry[2] for entry in entries])
+        else:
+            snapshot["pool"] = pool
+            snapshot["items"] = [entry[2] for entry in entries]
+        return snapshot
+
+    def _restore(self, snapshot, items):
+        """Contadores y frontera de un snapshot; `items` son sus nodos o índices."""
+        self.expanded_nodes = snapshot["expanded_nodes"]
+        self._generated_count = snapshot["generated_count"]
+        fringe_class = BucketQueue if snapshot["fringe_type"] == "BucketQueue" else HeapQueue
+        fringe = self.new_fringe(fringe_class)
+        # En orden (f, contador) para que cada bucket conserve su orden FIFO
+        for f_value, count, item in sorted(
+                zip(snapshot["priorities"], snapshot["counts"], items),
+                key=lambda entry: entry[:2]):
+            fringe.push(f_value, count, item)
+        fringe.max_size = snapshot["max_size"]
+        return fringe
+
     def search(self):
+        """
+        Realiza la búsqueda A* y devuelve el nodo objetivo, None si no hay
+        solución o un `BudgetExceeded` si se agota el presupuesto.
+        """
+        if self.budget is not None:
+            self.budget.start(self, "f")
+        try:
+            result = self._search()
+        except BudgetBreach as breach:
+            return breach.outcome
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+        return result
+
+    def _search(self):
         """
         Realiza la búsqueda A* en árbol.
         """
         # Reiniciar contadores
         self.expanded_nodes = 0
         self._generated_count = 0
-        
+        self.max_fringe_size = 0
+        if self.progress is not None:
+            self.progress.start(self, "f")
+
         try:
             start_state = self.problem.get_start_states()[0]
         except IndexError:
             return None  # No hay estado inicial
-            
-        root = Node(state=start_state)
+
+        if self.node_pool:
+            return self._search_pooled(start_state)
+
+        root = self.node_class(state=start_state)
         root.location = "root"
-        
-        fringe = [] # cola de prioridad (heapq)
-        f_root = self.f(root)
 
-        # Añadir contador de desempate a raray
-        heapq.heappush(fringe, (f_root, self._generated_count, root))
-        self._generated_count += 1
+        checkpoint = self.checkpoint
+        snapshot = checkpoint.load(self, "tree") if checkpoint is not None else None
+        if snapshot is None:
+            f_root = self.f(root)
+            fringe = self._new_fringe(f_root) # cola de prioridad
+
+            # Añadir contador de desempate a raray
+            fringe = self._push(fringe, f_root, root)
+        else:
+            nodes = unpack_nodes(snapshot["nodes"])
+            fringe = self._restore(snapshot, [nodes[index] for index in snapshot["items"]])
+        if checkpoint is not None:
+            checkpoint.start(self.expanded_nodes)
+        self._schedule_tick()
 
         while fringe:
-            _, _, node = heapq.heappop(fringe)
+            f_value, _, node = fringe.pop()
 
             if self.problem.is_goal_state(node.state):
+                self.max_fringe_size = fringe.max_size
                 return node
 
             current_expansion_order = self.expanded_nodes
             node.expanded_order = current_expansion_order
             self.expanded_nodes += 1
-            
+
             # Generar sucesores en orden lexicográfico
-            successors = sorted(self.problem.successors(node.state))
+            successors = self.sort(self.problem.successors(node.state))
 
             for action, result_state, cost in successors:
-                child = Node(
+                child = self.node_class(
                     state=result_state,
                     parent=node,
                     action=action,
@@ -74,15 +202,242 @@ class TreeAStar(SearchAlgorithm):
 
                 # Asignar atributos al *hijo*
                 child.expanded_order = current_expansion_order
-                child.location = f"depth_{child.depth}_node_{current_expansion_order}"
+                child.set_location(current_expansion_order)
 
                 f_child = self.f(child)
                 # Añadir contador de desempate
-                heapq.heappush(fringe, (f_child, self._generated_count, child))
-                self._generated_count += 1
-                
+                fringe = self._push(fringe, f_child, child)
+
+            if self.expanded_nodes >= self._next_tick:
+                self._tick(self.expanded_nodes, f_value, len(fringe),
+                           lambda: self._snapshot("tree", fringe))
+
+        self.max_fringe_size = fringe.max_size
+        return None
+
+    def _search_pooled(self, start_state):
+        """
+        Mismo bucle que `search`, pero la frontera guarda índices de un
+        `NodePool` en lugar de objetos `Node`.
+        """
+        heuristic = self.heuristic
+        checkpoint = self.checkpoint
+        snapshot = checkpoint.load(self, "pooled") if checkpoint is not None else None
+        if snapshot is None:
+            pool = NodePool()
+            root = pool.add(start_state)
+
+            f_root = heuristic(start_state)
+            fringe = self._new_fringe(f_root)
+            fringe = self._push(fringe, f_root, root)
+        else:
+            pool = snapshot["pool"]
+            fringe = self._restore(snapshot, snapshot["items"])
+        if checkpoint is not None:
+            checkpoint.start(self.expanded_nodes)
+        self._schedule_tick()
+
+        while fringe:
+            f_value, _, index = fringe.pop()
+            state = pool.states[index]
+
+            if self.problem.is_goal_state(state):
+                self.max_fringe_size = fringe.max_size
+                return pool.node(index)
+
+            current_expansion_order = self.expanded_nodes
+            pool.expanded_order[index] = current_expansion_order
+            self.expanded_nodes += 1
+
+            path_cost = pool.path_cost[index]
+            successors = self.sort(self.problem.successors(state))
+
+            for action, result_state, cost in successors:
+                child_cost = path_cost + cost
+                child = pool.add(
+                    result_state, index, action, child_cost,
+                    expanded_order=current_expansion_order,
+                    location=current_expansion_order,
+                )
+                fringe = self._push(fringe, child_cost + heuristic(result_state), child)
+
+            if self.expanded_nodes >= self._next_tick:
+                self._tick(self.expanded_nodes, f_value, len(fringe),
+                           lambda: self._snapshot("pooled", fringe, pool))
+
+        self.max_fringe_size = fringe.max_size
         return None
 
     def tree_search(self):
         """Interface method for tree search"""
-        return self.search()
\ No newline at end of file
+        return self.search()
+
+class GraphAStar(TreeAStar):
+    """
+    Implementa el algoritmo A* para búsqueda en grafo.
+
+    Mantiene una tabla con el mejor g(n) conocido para cada estado y un
+    conjunto de estados cerrados. Las entradas del heap que quedan
+    obsoletas (el estado ya se cerró o se encontró un camino mejor) se
+    descartan al extraerlas, de modo que la memoria queda acotada por el
+    número de estados distintos y no por el número de caminos.
+
+    Con `indexed_fringe=True` la frontera es una `IndexedPriorityQueue`
+    indexada por estado y no quedan entradas obsoletas: la mejora de g(n)
+    de un estado en la frontera se hace con decrease-key.
+
+    Los empates de f(n) se deshacen por el estado y después en orden FIFO,
+    igual que `hlog-graph-astar`, así que se expanden los mismos estados y
+    en el mismo orden que en el framework (los estados deben poder
+    compararse con ``<``). Por eso la frontera es siempre un heap: los
+    buckets de `BucketQueue` solo guardan el orden FIFO y `bucket_fringe`
+    no tiene efecto.
+    """
+
+    _graph_search = True
+
+    def _new_fringe(self, f_root):
+        """Siempre un heap (ver la documentación de la clase)."""
+        return self.new_fringe(HeapQueue)
+
+    def _push(self, fringe, f_value, node):
+        """Inserta `node` con prioridad (f, (estado, contador))."""
+        fringe.push(f_value, (node.state, self._generated_count), node)
+        self._generated_count += 1
+        return fringe
+
+    def _search(self):
+        """
+        Realiza la búsqueda A* en grafo.
+        """
+        if self.checkpoint is not None:
+            raise ValueError("GraphAStar no admite checkpoint.")
+        if self.node_pool:
+            raise ValueError("GraphAStar no admite node_pool.")
+        # Reiniciar contadores
+        self.expanded_nodes = 0
+        self._generated_count = 0
+        self.max_fringe_size = 0
+        if self.progress is not None:
+            self.progress.start(self, "f")
+
+        try:
+            start_state = self.problem.get_start_states()[0]
+        except IndexError:
+            return None  # No hay estado inicial
+
+        root = self.node_class(state=start_state)
+        root.location = "root"
+
+        if self.indexed_fringe:
+            return self._search_indexed(root, closed=set())
+
+        best_g = {start_state: 0}  # mejor g(n) conocido por estado
+        closed = set()
+
+        f_root = self.f(root)
+        fringe = self._new_fringe(f_root)  # cola de prioridad
+        fringe = self._push(fringe, f_root, root)
+        self._schedule_tick()
+
+        while fringe:
+            f_value, _, node = fringe.pop()
+
+            # Descartar entradas obsoletas o de estados ya cerrados
+            if node.state in closed or node.path_cost > best_g[node.state]:
+                continue
+
+            if self.problem.is_goal_state(node.state):
+                self.max_fringe_size = fringe.max_size
+                return node
+
+            closed.add(node.state)
+
+            current_expansion_order = self.expanded_nodes
+            node.expanded_order = current_expansion_order
+            self.expanded_nodes += 1
+
+            # Generar sucesores en orden lexicográfico
+            successors = self.sort(self.problem.successors(node.state))
+
+            for action, result_state, cost in successors:
+                if result_state in closed:
+                    continue
+
+                path_cost = node.path_cost + cost
+                if path_cost >= best_g.get(result_state, float("inf")):
+                    continue
+                best_g[result_state] = path_cost
+
+                child = self.node_class(
+                    state=result_state,
+                    parent=node,
+                    action=action,
+                    path_cost=path_cost
+                )
+
+                child.expanded_order = current_expansion_order
+                child.set_location(current_expansion_order)
+
+                fringe = self._push(fringe, self.f(child), child)
+
+            if self.expanded_nodes >= self._next_tick:
+                self._tick(self.expanded_nodes, f_value, len(fringe))
+
+        self.max_fringe_size = fringe.max_size
+        return None
+
+    def _search_indexed(self, root, closed):
+        """
+        Bucle de A* en grafo sobre una `IndexedPriorityQueue` indexada por
+        estado; los estados de `closed` (un conjunto) no se vuelven a generar.
+        La prioridad es (f, estado, contador), como en el heap de `_search`.
+        """
+        fringe = self.new_fringe(IndexedPriorityQueue)
+        fringe.push(root.state, (self.f(root), root.state, self._generated_count), root)
+        self._generated_count += 1
+        self._schedule_tick()
+
+        while fringe:
+            (f_value, _, _), _, node = fringe.pop()
+
+            if self.problem.is_goal_state(node.state):
+                self.max_fringe_size = fringe.max_size
+                return node
+
+            closed.add(node.state)
+
+            current_expansion_order = self.expanded_nodes
+            node.expanded_order = current_expansion_order
+            self.expanded_nodes += 1
+
+            # Generar sucesores en orden lexicográfico
+            successors = self.sort(self.problem.successors(node.state))
+
+            for action, result_state, cost in successors:
+                if result_state in closed:
+                    continue
+
+                child = self.node_class(
+                    state=result_state,
+                    parent=node,
+                    action=action,
+                    path_cost=node.path_cost + cost
+                )
+                child.expanded_order = current_expansion_order
+                child.set_location(current_expansion_order)
+
+                # Inserta o hace decrease-key si mejora al que ya está
+                fringe.push(result_state, (self.f(child), result_state, self._generated_count),
+                            child)
+                self._generated_count += 1
+
+            if self.expanded_nodes >= self._next_tick:
+                self._tick(self.expanded_nodes, f_value, len(fringe))
+
+        self.max_fringe_size = fringe.max_size
+        return None
+
+    def graph_search(self):
+        """Interface method for graph search"""
+        return self.search()
@@ -0,0 +1,182 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from search_algorithm import SearchAlgorithm
+from node import Node
+from priority_queue import HeapQueue
+
+
+class BidirectionalSearch(SearchAlgorithm):
+    """Bidirectional uniform-cost / A* search for problems with known goals.
+
+    The problem must provide `successors(state)`, `predecessors(state)` (the
+    ``(action, previous_state, cost)`` moves that lead *into* `state`) and
+    `goal_states()`. One search runs forward from the start state and one
+    backward from the goal states; every generated state that the other side
+    has already reached gives a candidate cost ``mu``.
+
+    `heuristic` estimates the cost from a state to the goal (forward side)
+    and `backward_heuristic` the cost from the start to a state (backward
+    side). Without heuristics both sides are uniform-cost and the search
+    stops when ``top_forward + top_backward >= mu``; otherwise it stops when
+    either side's lowest f reaches ``mu``. Both rules only stop once no
+    cheaper meeting point can exist, so the result is optimal as long as the
+    heuristics are consistent.
+
+    The answer is returned as a plain forward `Node` chain from the start to
+    a goal. `expanded_nodes` counts expansions on both sides.
+    """
+
+    def __init__(self, problem, heuristic=None, backward_heuristic=None):
+        super().__init__(problem)
+        self.heuristic = heuristic
+        self.backward_heuristic = backward_heuristic
+        self.expanded_nodes = 0
+        self.forward_expanded = 0
+        self.backward_expanded = 0
+        self.max_fringe_size = 0
+        self._generated_count = 0
+
+    def search(self):
+        """Return the goal `Node` of a cheapest path, or None."""
+        self.expanded_nodes = 0
+        self.forward_expanded = 0
+        self.backward_expanded = 0
+        self.max_fringe_size = 0
+        self._generated_count = 0
+
+        start_states = self.problem.get_start_states()
+        if not start_states:
+            return None
+        start_state = start_states[0]
+
+        root = self.node_class(start_state)
+        root.location = "root"
+        if self.problem.is_goal_state(start_state):
+            return root
+
+        goals = list(self.problem.goal_states())
+        if not goals:
+            return None
+
+        h_forward = self.heuristic or (lambda state: 0)
+        h_backward = self.backward_heuristic or (lambda state: 0)
+        ucs = self.heuristic is None and self.backward_heuristic is None
+
+        # Per side: fringe of (f, count, node), best g and node per state, closed set
+        forward = _Side(self.problem.successors, h_forward, self.new_fringe(HeapQueue))
+        backward = _Side(self.problem.predecessors, h_backward, self.new_fringe(HeapQueue))
+        forward.push(root, self._next_count())
+        for goal in goals:
+            node = self.node_class(goal)
+            node.location = "root"
+            backward.push(node, self._next_count())
+
+        best_cost = float("inf")
+        meeting = None
+
+        while forward.fringe and backward.fringe:
+            top_forward = forward.top()
+            top_backward = backward.top()
+            if ucs:
+                if top_forward + top_backward >= best_cost:
+                    break
+            elif max(top_forward, top_backward) >= best_cost:
+                break
+
+            # Expand the side with the smaller fringe
+            if len(forward.fringe) <= len(backward.fringe):
+                side, other, is_forward = forward, backward, True
+            else:
+                side, other, is_forward = backward, forward, False
+
+            node = side.pop()
+            if node is None:
+                continue
+
+            order = self.expanded_nodes
+            self.expanded_nodes += 1
+            if is_forward:
+                self.forward_expanded += 1
+            else:
+                self.backward_expanded += 1
+
+            for action_name, state, cost in self.sort(side.expand(node.state), key=lambda x: x[0]):
+                g = node.path_cost + cost
+                if state in side.closed or g >= side.best_g.get(state, float("inf")):
+                    continue
+                child = self.node_class(state, node, action_name, g)
+                child.expanded_order = order
+                child.set_location(order)
+                side.push(child, self._next_count())
+
+                other_g = other.best_g.get(state)
+                if other_g is not None and g + other_g < best_cost:
+                    best_cost = g + other_g
+                    meeting = state
+
+            fringe_size = len(forward.fringe) + len(backward.fringe)
+            if fringe_size > self.max_fringe_size:
+                self.max_fringe_size = fringe_size
+
+        if meeting is None:
+            return None
+        return self._join(forward.nodes[meeting], backward.nodes[meeting])
+
+    def _next_count(self):
+        count = self._generated_count
+        self._generated_count += 1
+        return count
+
+    def _join(self, forward_node, backward_node):
+        """Append the backward chain (meeting point -> goal) to `forward_node`."""
+        node = forward_node
+        while backward_node.parent is not None:
+            successor = backward_node.parent
+            step_cost = backward_node.path_cost - successor.path_cost
+            node = Node(successor.state, node, backward_node.action, node.path_cost + step_cost)
+            node.expanded_order = backward_node.expanded_order
+            node.set_location(backward_node.expanded_order)
+            backward_node = successor
+        return node
+
+    def tree_search(self):
+        """Interface method (the meeting test needs the reached states)."""
+        return self.search()
+
+
+class _Side:
+    """Fringe and bookkeeping of one search direction.
+
+    In the backward side a node's `parent` is the next state towards the
+    goal and its `action` the forward action that leads there.
+    """
+
+    def __init__(self, expand, heuristic, fringe):
+        self.expand = expand
+        self.heuristic = heuristic
+        self.fringe = fringe
+        self.best_g = {}
+        self.nodes = {}
+        self.closed = set()
+
+    def push(self, node, count):
+        self.best_g[node.state] = node.path_cost
+        self.nodes[node.state] = node
+        self.fringe.push(node.path_cost + self.heuristic(node.state), count, node)
+
+    def top(self):
+        """Lowest f in the fringe (a lower bound even if the entry is stale)."""
+        return self.fringe.peek()[0]
+
+    def pop(self):
+        """Pop the best node, or None if the entry is stale or closed."""
+        _, _, node = self.fringe.pop()
+        if node.state in self.closed or node.path_cost > self.best_g[node.state]:
+            return None
+        self.closed.add(node.state)
+        return node
@@ -0,0 +1,130 @@
+import sys
+import os
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from progress import current_rss_kb
+
+
+class BudgetBreach(Exception):
+    """Raised by `SearchBudget.check` inside a search loop; the algorithm's
+    `search()` catches it and returns the `BudgetExceeded` it carries."""
+
+    def __init__(self, outcome):
+        super().__init__(outcome.reason)
+        self.outcome = outcome
+
+
+class BudgetExceeded:
+    """Outcome of a search stopped by its `SearchBudget`.
+
+    It is falsy, so code that only tests ``if result:`` treats it like "no
+    solution", but it is not None and keeps what was learnt until the stop:
+    `reason` (``"time"``, ``"expanded"``, ``"fringe"`` or ``"memory"``),
+    `bound` (the deepest depth limit reached for IDS, the highest f expanded
+    for A*, which is a lower bound of the optimal cost with a consistent
+    heuristic), `expanded`, `generated`, `fringe`, `elapsed` and `rss_kb`.
+    """
+
+    def __init__(self, reason, algorithm, bound_kind, bound, expanded, generated,
+                 fringe, elapsed, rss_kb):
+        self.reason = reason
+        self.algorithm = algorithm
+        self.bound_kind = bound_kind
+        self.bound = bound
+        self.expanded = expanded
+        self.generated = generated
+        self.fringe = fringe
+        self.elapsed = elapsed
+        self.rss_kb = rss_kb
+
+    def __bool__(self):
+        return False
+
+    def as_dict(self):
+        return {
+            "event": "budget_exceeded",
+            "reason": self.reason,
+            "algorithm": self.algorithm,
+            "bound_kind": self.bound_kind,
+            "bound": self.bound,
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "fringe": self.fringe,
+            "elapsed": round(self.elapsed, 6),
+            "rss_kb": self.rss_kb,
+        }
+
+    def __repr__(self):
+        return (f"BudgetExceeded({self.reason!r}, {self.bound_kind}={self.bound!r}, "
+                f"expanded={self.expanded}, elapsed={self.elapsed:.3f})")
+
+
+class SearchBudget:
+    """Limits of one search: wall time in seconds, expanded nodes, fringe
+    size and resident memory in KiB (None means no limit).
+
+    Works like `ProgressReporter`: the algorithms call `start` when a search
+    begins and `check` whenever ``expanded_nodes`` reaches `next_check`.
+    The expansion limit is exact; time, fringe and memory are only looked
+    at every `check_every` expansions, so they may be overshot by that
+    many expansions. `TreeIDS` also checks at the start of every iteration,
+    so a start state with no successors cannot keep it deepening forever.
+    """
+
+    def __init__(self, max_time=None, max_expanded=None, max_fringe=None,
+                 max_rss_kb=None, check_every=1000):
+        self.max_time = max_time
+        self.max_expanded = max_expanded
+        self.max_fringe = max_fringe
+        self.max_rss_kb = max_rss_kb
+        self.check_every = check_every
+        self.next_check = 0
+        self.bound = None
+        self._algorithm = None
+        self._bound_kind = None
+        self._start_time = None
+
+    def start(self, algorithm, bound_kind):
+        """Reset the clock and the best bound for a new search."""
+        self._algorithm = algorithm
+        self._bound_kind = bound_kind
+        self._start_time = time.perf_counter()
+        self.bound = None
+        self.next_check = self._schedule(0)
+
+    def check(self, expanded, bound, fringe_size):
+        """Raise `BudgetBreach` if a limit was reached."""
+        if self._start_time is None:
+            raise RuntimeError("SearchBudget.check() called before start()")
+        if self.bound is None or bound > self.bound:
+            self.bound = bound
+        elapsed = time.perf_counter() - self._start_time
+        rss_kb = current_rss_kb() if self.max_rss_kb is not None else None
+        reason = None
+        if self.max_expanded is not None and expanded >= self.max_expanded:
+            reason = "expanded"
+        elif self.max_time is not None and elapsed >= self.max_time:
+            reason = "time"
+        elif self.max_fringe is not None and fringe_size >= self.max_fringe:
+            reason = "fringe"
+        elif rss_kb is not None and rss_kb >= self.max_rss_kb:
+            reason = "memory"
+        if reason is not None:
+            algorithm = self._algorithm
+            raise BudgetBreach(BudgetExceeded(
+                reason, type(algorithm).__name__, self._bound_kind, self.bound,
+                expanded, getattr(algorithm, "_generated_count", expanded),
+                fringe_size, elapsed, rss_kb if rss_kb is not None else current_rss_kb(),
+            ))
+        self.next_check = self._schedule(expanded)
+
+    def _schedule(self, expanded):
+        """Expansion count at which `check` has to be called next."""
+        next_check = expanded + self.check_every
+        if self.max_expanded is not None:
+            next_check = min(next_check, self.max_expanded)
+        return next_check
@@ -0,0 +1,156 @@
+import sys
+import os
+import gzip
+import pickle
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from node import Node
+
+FORMAT_VERSION = 1
+
+
+def pack_nodes(nodes):
+    """Flatten the parent chains of `nodes` into a node table.
+
+    Returns ``(table, indices)``: `table` holds one column per `Node`
+    attribute (``parent`` is an index into the table, -1 for the root) with
+    every shared ancestor stored once and parents before their children,
+    and `indices` gives the table index of each node of `nodes`.
+    """
+    table = {
+        "state": [], "parent": [], "action": [], "path_cost": [],
+        "expanded_order": [], "location": [],
+    }
+    seen = {}  # id(node) -> index
+    indices = []
+    for node in nodes:
+        chain = []
+        while node is not None and id(node) not in seen:
+            chain.append(node)
+            node = node.parent
+        parent = seen[id(node)] if node is not None else -1
+        for node in reversed(chain):
+            seen[id(node)] = len(table["state"])
+            table["state"].append(node.state)
+            table["parent"].append(parent)
+            table["action"].append(node.action)
+            table["path_cost"].append(node.path_cost)
+            table["expanded_order"].append(node.expanded_order)
+            table["location"].append(node._location)
+            parent = seen[id(node)]
+        indices.append(parent)
+    return table, indices
+
+
+def unpack_nodes(table):
+    """Rebuild the `Node` objects of a table made by `pack_nodes`."""
+    nodes = []
+    columns = zip(table["state"], table["parent"], table["action"], table["path_cost"],
+                  table["expanded_order"], table["location"])
+    for state, parent, action, path_cost, expanded_order, location in columns:
+        node = Node(state, nodes[parent] if parent >= 0 else None, action, path_cost)
+        node.expanded_order = expanded_order
+        node.location = location
+        nodes.append(node)
+    return nodes
+
+
+class Checkpointer:
+    """Periodic on-disk snapshots of a long search, every `every`
+    expansions or `interval` seconds (whichever comes first; None disables
+    either).
+
+    Works like `ProgressReporter`: the algorithms call `check` whenever
+    ``expanded_nodes`` reaches `next_check`, passing a callable that builds
+    the snapshot, so the snapshot is only built when one is written. A
+    snapshot is a gzip-compressed pickle of a dict with the fringe, the
+    counters and the node table of `pack_nodes`; it is written to a
+    temporary file and renamed over `path`, so a process killed while
+    writing leaves the previous snapshot intact.
+
+    When `search()` starts and `path` exists (and `resume` is true) the
+    algorithm continues from the snapshot, with the same result and the
+    same ``expanded_order`` numbering as an uninterrupted run. States and
+    actions must be picklable. With `remove_on_finish` the file is deleted
+    once a search ends (solution found or space exhausted).
+    """
+
+    def __init__(self, path, every=100000, interval=None, check_every=1000,
+                 resume=True, remove_on_finish=True):
+        if every is None and interval is None:
+            raise ValueError("Checkpointer needs `every` or `interval`")
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self.check_every = check_every
+        self.resume = resume
+        self.remove_on_finish = remove_on_finish
+        self.saved = 0
+        self.next_check = 0
+        self._next_save = None
+        self._next_time = None
+
+    def start(self, expanded=0):
+        """Reset the schedule for a search that is at `expanded` expansions."""
+        self._next_save = None if self.every is None else expanded + self.every
+        self._next_time = None if self.interval is None else time.perf_counter() + self.interval
+        self.saved = 0
+        self.next_check = self._schedule(expanded)
+
+    def load(self, algorithm, kind):
+        """The snapshot at `path` for `algorithm`, or None if there is none.
+
+        Raises ValueError if the snapshot was written by another algorithm
+        or search mode.
+        """
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        with gzip.open(self.path, "rb") as fh:
+            snapshot = pickle.load(fh)
+        if snapshot.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unknown checkpoint format in {self.path}")
+        expected = (type(algorithm).__name__, kind)
+        found = (snapshot["algorithm"], snapshot["kind"])
+        if found != expected:
+            raise ValueError(f"Checkpoint {self.path} is for {found}, not {expected}")
+        return snapshot
+
+    def check(self, expanded, snapshot):
+        """Write ``snapshot()`` if `every` expansions or `interval` seconds passed."""
+        if self._next_save is None and self._next_time is None:
+            raise RuntimeError("Checkpointer.check() called before start()")
+        now = time.perf_counter()
+        if ((self._next_save is not None and expanded >= self._next_save)
+                or (self._next_time is not None and now >= self._next_time)):
+            self.save(snapshot())
+            if self.every is not None:
+                self._next_save = expanded + self.every
+            if self.interval is not None:
+                self._next_time = now + self.interval
+        self.next_check = self._schedule(expanded)
+
+    def save(self, snapshot):
+        snapshot["version"] = FORMAT_VERSION
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=1) as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self.saved += 1
+
+    def finish(self):
+        """Called when a search ends; removes the snapshot if asked to."""
+        if self.remove_on_finish and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _schedule(self, expanded):
+        """Expansion count at which `check` has to be called next."""
+        if self.interval is None:
+            return self._next_save
+        next_check = expanded + self.check_every
+        if self._next_save is not None:
+            next_check = min(next_check, self._next_save)
+        return next_check
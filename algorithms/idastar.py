@@ -0,0 +1,112 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from ids import TreeIDS
+from checkpoint import unpack_nodes
+
+
+class IDAStar(TreeIDS):
+    """Iterative Deepening A* (IDA*).
+
+    Same loop as `TreeIDS`, but each iteration bounds f(n) = g(n) + h(n)
+    instead of the depth. The next bound is the smallest f that exceeded
+    the current one, so no iteration is wasted on problems with non-unit
+    costs (e.g. Kiwis and Dogs). Memory is linear in the solution depth.
+
+    `progress`, `budget` and `checkpoint` work as in `TreeIDS`, with the
+    f bound of the current iteration in place of the depth limit.
+    """
+
+    bound_kind = "f"
+
+    def __init__(self, problem, heuristic=None, progress=None, budget=None,
+                 checkpoint=None):
+        super().__init__(problem, progress=progress, budget=budget, checkpoint=checkpoint)
+        self.heuristic = heuristic or problem.heuristic
+        if not self.heuristic:
+            raise ValueError("La búsqueda IDA* requiere una función heurística.")
+
+    def f(self, node):
+        """f(n) = g(n) + h(n)"""
+        return node.path_cost + self.heuristic(node.state)
+
+    def _search(self):
+        """Iterative Deepening A* (IDA*)."""
+        fringe, next_bound = None, float("inf")
+        snapshot = self._load_checkpoint("ida")
+        if snapshot is not None:
+            start_state = snapshot["start_state"]
+            bound = snapshot["limit"]
+            next_bound = snapshot["next_bound"]
+            nodes = unpack_nodes(snapshot["nodes"])
+            fringe = [nodes[index] for index in snapshot["fringe"]]
+        else:
+            # Fetched once: every iteration has to search from the start
+            # state the first bound was computed for
+            try:
+                start_state = self.problem.get_start_states()[0]
+            except IndexError:
+                return None # No hay estado inicial
+            bound = self.heuristic(start_state)  # f of the root, g = 0
+
+        while True:
+            if self.budget is not None:
+                self.budget.check(self.expanded_nodes, bound, 0)
+            result, next_bound = self.cost_limited_search(bound, start_state, fringe, next_bound)
+            if result is not None:  # Found a solution
+                return result
+            if next_bound == float("inf"):  # Nothing was pruned: no solution
+                return None
+            bound = next_bound
+            fringe, next_bound = None, float("inf")
+
+    def cost_limited_search(self, bound, start_state=None, fringe=None, next_bound=float("inf")):
+        """Depth-first search that prunes nodes with f(n) > `bound`.
+
+        Returns ``(goal_node, None)`` if a goal is found, otherwise
+        ``(None, next_bound)`` with the minimum pruned f-value. The search
+        starts at `start_state` (the problem's first start state if not
+        given); a `fringe` and `next_bound` restored from a checkpoint
+        continue an interrupted iteration.
+        """
+        if fringe is None:
+            if start_state is None:
+                start_state = self.problem.get_start_states()[0]
+            node = self.node_class(start_state)
+            node.expanded_order = 0
+            node.location = "root"
+
+            # Fringe as LIFO stack (DFS)
+            fringe = [node]
+
+        self._schedule_tick()
+        while fringe:
+            current_node = fringe.pop()
+
+            f_value = self.f(current_node)
+            if f_value > bound:
+                next_bound = min(next_bound, f_value)
+                continue
+
+            # Goal test
+            if self.problem.is_goal_state(current_node.state):
+                return current_node, None
+
+            # Generate successors in lexicographical order
+            successors = self.sort(self.problem.successors(current_node.state))
+            # Reverse to preserve lexicographic order when using stack (LIFO)
+            for action, result_state, cost in reversed(successors):
+                child = self.node_class(result_state, current_node, action, current_node.path_cost + cost)
+                child.expanded_order = self.expanded_nodes
+                child.set_location(self.expanded_nodes)
+                fringe.append(child)
+                self.expanded_nodes += 1
+            if self.expanded_nodes >= self._next_tick:
+                self._tick(self.expanded_nodes, bound, len(fringe), lambda: self._snapshot(
+                    "ida", bound, fringe, start_state=start_state, next_bound=next_bound))
+
+        return None, next_bound
@@ -6,43 +6,138 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 from search_algorithm import SearchAlgorithm
-from node import Node
+from budget import BudgetBreach
+from checkpoint import pack_nodes, unpack_nodes
 
 
 class TreeIDS(SearchAlgorithm):
+    """Tree Iterative Deepening Search.
 
-    def __init__(self, problem):
+    With ``fast=True`` each iteration walks an explicit path stack where
+    every frame keeps its sorted successor list and the index of the next
+    child, so only the nodes on the current path are materialised. Sorted
+    successor lists are cached by state and shared by all iterations until
+    `cache_limit` successor entries are stored; since iterations grow one
+    level at a time the cache holds the shallow layers. The result and the
+    ``expanded_nodes`` numbering are the same as with the classic loop.
+
+    `progress` is an optional `ProgressReporter` that gets progress events
+    (current depth limit, counter, stack size, nodes/s and RSS).
+
+    `budget` is an optional `SearchBudget` (time, expanded nodes, fringe
+    size and memory). When it runs out `search` returns a `BudgetExceeded`
+    with the deepest limit reached instead of iterating forever.
+
+    `checkpoint` is an optional `Checkpointer`. The current depth limit, the
+    counter and the DFS fringe (or path stack with ``fast=True``) with its
+    parent chains are saved periodically, and `search` resumes from the
+    file if it exists, with the same result and ``expanded_order`` numbers.
+    """
+
+    # What the iteration limit bounds, as reported to progress and budget
+    bound_kind = "depth"
+
+    def __init__(self, problem, fast=False, cache_limit=100000, progress=None, budget=None,
+                 checkpoint=None):
         super().__init__(problem)
         # Count of generated/expanded nodes (semantics: increment when generating children)
         self.expanded_nodes = 0
+        self.fast = fast
+        self.cache_limit = cache_limit
+        self.progress = progress
+        self.budget = budget
+        self.checkpoint = checkpoint
+        self._successor_cache = {}
+        self._cache_used = 0
 
     def search(self):
-        """Iterative Deepening Search (IDS)."""
-        depth = 0
+        """Iterative Deepening Search (IDS).
+
+        Returns the goal node, None if there is no start state, or a
+        `BudgetExceeded` if the budget runs out.
+        """
+        if self.progress is not None:
+            self.progress.start(self, self.bound_kind)
+        if self.budget is not None:
+            self.budget.start(self, self.bound_kind)
+        try:
+            result = self._search()
+        except BudgetBreach as breach:
+            return breach.outcome
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+        return result
+
+    def _search(self):
+        """Iterative deepening loop; `search` wraps it with the budget and
+        checkpoint handling."""
+        if self.fast:
+            return self._search_fast()
+
+        depth, fringe = 0, None
+        snapshot = self._load_checkpoint("classic")
+        if snapshot is not None:
+            depth = snapshot["limit"]
+            start_state = snapshot["start_state"]
+            nodes = unpack_nodes(snapshot["nodes"])
+            fringe = [nodes[index] for index in snapshot["fringe"]]
+        else:
+            # Fetched once: problems such as NQueensIR draw a new random
+            # board on every call to get_start_states()
+            try:
+                start_state = self.problem.get_start_states()[0]
+            except IndexError:
+                return None # No hay estado inicial
+
         while True:
-            result = self.depth_limited_search(depth)
+            if self.budget is not None:
+                self.budget.check(self.expanded_nodes, depth, 0)
+            result = self.depth_limited_search(depth, start_state, fringe)
             if result is not None:  # Found a solution
                 return result
             depth += 1  # Increment depth for next iteration
+            fringe = None
+
+    def _load_checkpoint(self, kind):
+        """Load the checkpoint (if any), restore the counter and start it."""
+        if self.checkpoint is None:
+            return None
+        snapshot = self.checkpoint.load(self, kind)
+        if snapshot is not None:
+            self.expanded_nodes = snapshot["expanded_nodes"]
+        self.checkpoint.start(self.expanded_nodes)
+        return snapshot
+
+    def _snapshot(self, kind, limit, nodes, **extra):
+        """State of the current iteration saved by the `Checkpointer`."""
+        table, indices = pack_nodes(nodes)
+        return dict(extra, algorithm=type(self).__name__, kind=kind, limit=limit,
+                    expanded_nodes=self.expanded_nodes, nodes=table, fringe=indices)
 
-    def depth_limited_search(self, limit):
+    def depth_limited_search(self, limit, start_state=None, fringe=None):
         """Depth-Limited Search (DLS) with depth limit `limit`.
 
-        Returns the goal node if found, otherwise None.
+        Returns the goal node if found, otherwise None. The search starts
+        at `start_state` (the problem's first start state if not given). A
+        `fringe` restored from a checkpoint continues an interrupted
+        iteration.
         """
-        try:
-            start_state = self.problem.get_start_states()[0]
-        except IndexError:
-            return None # No hay estado inicial
-        node = Node(start_state)
+        if fringe is None:
+            if start_state is None:
+                try:
+                    start_state = self.problem.get_start_states()[0]
+                except IndexError:
+                    return None # No hay estado inicial
+            node = self.node_class(start_state)
 
-        # Optional metadata used elsewhere in the project
-        node.expanded_order = 0
-        node.location = "root"
+            # Optional metadata used elsewhere in the project
+            node.expanded_order = 0
+            node.location = "root"
 
-        # Fringe as LIFO stack (DFS)
-        fringe = [node]
+            # Fringe as LIFO stack (DFS)
+            fringe = [node]
 
+        self._schedule_tick()
         while fringe:
             current_node = fringe.pop()
 
@@ -53,19 +148,114 @@ class TreeIDS(SearchAlgorithm):
             # Expand if within depth limit
             if current_node.depth < limit:
                 # Generate successors in lexicographical order
-                successors = sorted(self.problem.successors(current_node.state))
+                successors = self.sort(self.problem.successors(current_node.state))
                 # Reverse to preserve lexicographic order when using stack (LIFO)
                 for action, result_state, cost in reversed(successors):
-                    child = Node(result_state, current_node, action, current_node.path_cost + cost)
+                    child = self.node_class(result_state, current_node, action, current_node.path_cost + cost)
                     child.expanded_order = self.expanded_nodes
-                    child.location = f"depth_{child.depth}_node_{self.expanded_nodes}"
+                    child.set_location(self.expanded_nodes)
                     fringe.append(child)
                     # Increment the generated/expanded counter for bookkeeping
                     self.expanded_nodes += 1
+                if self.expanded_nodes >= self._next_tick:
+                    self._tick(self.expanded_nodes, limit, len(fringe), lambda: self._snapshot(
+                        "classic", limit, fringe, start_state=start_state))
 
         # Return None if no solution found within the given limit
         return None
 
+    def _search_fast(self):
+        """IDS over `_depth_limited_search_fast`, reusing the root node."""
+        try:
+            start_state = self.problem.get_start_states()[0]
+        except IndexError:
+            return None # No hay estado inicial
+        root = self.node_class(start_state)
+        root.expanded_order = 0
+        root.location = "root"
+
+        self._successor_cache = {}
+        self._cache_used = 0
+
+        depth, stack = 0, None
+        snapshot = self._load_checkpoint("fast")
+        if snapshot is not None:
+            depth = snapshot["limit"]
+            nodes = unpack_nodes(snapshot["nodes"])
+            path = [nodes[index] for index in snapshot["fringe"]]
+            root = path[0]
+            stack = [[node, self._sorted_successors(node.state), index, base]
+                     for node, index, base in zip(path, snapshot["next"], snapshot["base"])]
+
+        while True:
+            if self.budget is not None:
+                self.budget.check(self.expanded_nodes, depth, 0)
+            result = self._depth_limited_search_fast(root, depth, stack)
+            if result is not None:
+                return result
+            depth += 1
+            stack = None
+
+    def _sorted_successors(self, state):
+        """Sorted successors of `state`, cached while under `cache_limit`."""
+        successors = self._successor_cache.get(state)
+        if successors is not None:
+            return successors
+        successors = self.sort(self.problem.successors(state))
+        if self._cache_used + len(successors) <= self.cache_limit:
+            self._successor_cache[state] = successors
+            self._cache_used += len(successors)
+        return successors
+
+    def _depth_limited_search_fast(self, root, limit, stack=None):
+        """DLS on an explicit path stack of ``[node, successors, next, base]``.
+
+        The classic loop pushes the children in reverse order, so the first
+        child in lexicographic order gets the highest number of its batch;
+        `base` is the counter value at expansion time and the child at
+        position ``i`` of ``k`` gets ``base + k - 1 - i``. A `stack`
+        restored from a checkpoint continues an interrupted iteration.
+        """
+        if stack is None:
+            if self.problem.is_goal_state(root.state):
+                return root
+            if limit <= 0:
+                return None
+
+            successors = self._sorted_successors(root.state)
+            stack = [[root, successors, 0, self.expanded_nodes]]
+            self.expanded_nodes += len(successors)
+
+        self._schedule_tick()
+        while stack:
+            frame = stack[-1]
+            node, successors, index, base = frame
+            if index == len(successors):
+                stack.pop()
+                continue
+            frame[2] = index + 1
+
+            action, result_state, cost = successors[index]
+            child = self.node_class(result_state, node, action, node.path_cost + cost)
+            order = base + len(successors) - 1 - index
+            child.expanded_order = order
+            child.set_location(order)
+
+            if self.problem.is_goal_state(result_state):
+                return child
+
+            if child.depth < limit:
+                child_successors = self._sorted_successors(result_state)
+                stack.append([child, child_successors, 0, self.expanded_nodes])
+                self.expanded_nodes += len(child_successors)
+                if self.expanded_nodes >= self._next_tick:
+                    self._tick(self.expanded_nodes, limit, len(stack), lambda: self._snapshot(
+                        "fast", limit, [frame[0] for frame in stack],
+                        next=[frame[2] for frame in stack],
+                        base=[frame[3] for frame in stack]))
+
+        return None
+
     def tree_search(self):
         """Interface method for IDS (alias)."""
         return self.search()
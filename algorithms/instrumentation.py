@@ -0,0 +1,224 @@
+import cProfile
+import time
+
+from contextlib import contextmanager
+
+# Per-instance hook points of `SearchAlgorithm` that are swapped for timed versions
+_HOOKS = ("problem", "heuristic", "sort", "node_class", "new_fringe")
+
+
+class SearchStats:
+    """Timers and counters of one instrumented search.
+
+    `phases` maps a phase name (``successors``, ``sort``, ``heuristic``,
+    ``goal_test``, ``fringe_push``, ``fringe_pop``, ``node``, ...) to
+    ``[calls, seconds]``. Only the hot paths are timed, so the phases do
+    not add up to `total_time`: the rest is the algorithm's own loop.
+
+    `generated` counts every search node the algorithm created, roots
+    included: `TreeIDS` and `IDAStar` build a new root on every iteration
+    and each one counts. Algorithms that keep a `_generated_count` (A*,
+    `GraphAStar`, bidirectional, JPS) report it, since they do not build a
+    `Node` for every generated state; the rest are counted by the timed
+    `node_class`.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.expanded = 0
+        self.generated = 0
+        self.max_fringe = 0
+        self.total_time = 0.0
+        self.profile_path = None
+
+    def add(self, phase, seconds):
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    @property
+    def nodes_per_second(self):
+        """Expanded nodes per second of search."""
+        return self.expanded / self.total_time if self.total_time else 0.0
+
+    def as_dict(self):
+        return {
+            "total_time": self.total_time,
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "max_fringe": self.max_fringe,
+            "nodes_per_second": self.nodes_per_second,
+            "phases": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in self.phases.items()
+            },
+            "profile": self.profile_path,
+        }
+
+    def report(self):
+        """Human readable summary, one line per phase."""
+        lines = [
+            f"total {self.total_time:.3f}s, expanded {self.expanded}, "
+            f"generated {self.generated}, max fringe {self.max_fringe}, "
+            f"{self.nodes_per_second:.0f} nodes/s"
+        ]
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda p: -p[1][1]):
+            share = 100 * seconds / self.total_time if self.total_time else 0.0
+            lines.append(f"  {name:<12} {calls:>10} calls {seconds:>9.3f}s {share:5.1f}%")
+        return "\n".join(lines)
+
+
+def _timed(function, phase, stats):
+    clock = time.perf_counter
+    add = stats.add
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            add(phase, clock() - start)
+
+    return wrapper
+
+
+class _TimedProblem:
+    """Proxy of a problem that times the calls the algorithms make."""
+
+    _PHASES = {
+        "successors": "successors",
+        "predecessors": "predecessors",
+        "get_successors": "successors",
+        "is_goal_state": "goal_test",
+        "get_start_states": "start",
+    }
+
+    def __init__(self, problem, stats):
+        self._problem = problem
+        for name, phase in self._PHASES.items():
+            method = getattr(problem, name, None)
+            if method is not None:
+                setattr(self, name, _timed(method, phase, stats))
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+
+def _timed_node_class(cls, stats):
+    clock = time.perf_counter
+    add = stats.add
+
+    class TimedNode(cls):
+        __slots__ = ()
+
+        def __init__(self, *args, **kwargs):
+            start = clock()
+            super().__init__(*args, **kwargs)
+            add("node", clock() - start)
+            stats.generated += 1
+
+    TimedNode.__name__ = cls.__name__
+    return TimedNode
+
+
+def _timed_fringe_class(cls, stats):
+    clock = time.perf_counter
+    add = stats.add
+
+    class TimedFringe(cls):
+        def push(self, *args):
+            start = clock()
+            result = super().push(*args)
+            add("fringe_push", clock() - start)
+            if len(self) > stats.max_fringe:
+                stats.max_fringe = len(self)
+            return result
+
+        def pop(self):
+            start = clock()
+            result = super().pop()
+            add("fringe_pop", clock() - start)
+            return result
+
+    TimedFringe.__name__ = cls.__name__
+    return TimedFringe
+
+
+def _timed_fringe_factory(new_fringe, stats):
+    timed_classes = {}
+
+    def wrapper(cls, *args):
+        timed = timed_classes.get(cls)
+        if timed is None:
+            timed = timed_classes[cls] = _timed_fringe_class(cls, stats)
+        return new_fringe(timed, *args)
+
+    return wrapper
+
+
+@contextmanager
+def instrumented(algorithm, stats):
+    """Set timed versions of the problem, heuristic, `sort`, `node_class`
+    and `new_fringe` hooks on `algorithm` itself, and put the previous
+    instance attributes back afterwards.
+
+    Only this instance is touched: other algorithms, in this thread or
+    another, keep running on the plain classes and functions.
+    """
+    missing = object()
+    saved = {name: algorithm.__dict__.get(name, missing) for name in _HOOKS}
+
+    algorithm.problem = _TimedProblem(algorithm.problem, stats)
+    heuristic = getattr(algorithm, "heuristic", None)
+    if callable(heuristic):
+        algorithm.heuristic = _timed(heuristic, "heuristic", stats)
+    algorithm.sort = _timed(algorithm.sort, "sort", stats)
+    algorithm.node_class = _timed_node_class(algorithm.node_class, stats)
+    algorithm.new_fringe = _timed_fringe_factory(algorithm.new_fringe, stats)
+
+    try:
+        yield stats
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                algorithm.__dict__.pop(name, None)
+            else:
+                setattr(algorithm, name, value)
+
+
+def search_with_stats(algorithm, profile=None):
+    """Run ``algorithm.search()`` instrumented; returns ``(result, stats)``.
+
+    With `profile` set to a path, the run is also recorded with cProfile
+    and the `pstats` data is dumped there.
+    """
+    stats = SearchStats()
+    profiler = cProfile.Profile() if profile else None
+
+    with instrumented(algorithm, stats):
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = algorithm.search()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            stats.total_time = time.perf_counter() - start
+
+    stats.expanded = algorithm.expanded_nodes
+    # Algorithms that count generated nodes themselves know better than the
+    # timed Node class (pooled A* builds no Node per child); both counts
+    # include the roots (see `SearchStats`)
+    generated = getattr(algorithm, "_generated_count", None)
+    if generated is not None:
+        stats.generated = generated
+    stats.max_fringe = max(stats.max_fringe, getattr(algorithm, "max_fringe_size", 0) or 0)
+
+    if profiler is not None:
+        profiler.dump_stats(profile)
+        stats.profile_path = profile
+    return result, stats
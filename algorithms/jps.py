@@ -0,0 +1,208 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from search_algorithm import SearchAlgorithm
+from node import Node
+from priority_queue import HeapQueue
+
+# (action letter, dr, dc)
+_UP, _DOWN, _LEFT, _RIGHT = ("U", -1, 0), ("D", 1, 0), ("L", 0, -1), ("R", 0, 1)
+_ALL_DIRECTIONS = (_UP, _DOWN, _LEFT, _RIGHT)
+
+
+class JumpPointSearch(SearchAlgorithm):
+    """Jump Point Search for 4-connected uniform-cost grids (Pacman).
+
+    Works on the `walls` bitmap, `rows`/`cols` and `start_state` of
+    `PacmanProblem`. Paths are kept canonical by only turning from a
+    horizontal move to a vertical one where it is forced (the cell behind
+    on the new row is a wall); vertical moves may branch sideways anywhere.
+    Horizontal jumps stop at forced turns or at the food, and vertical jumps
+    also stop where a sideways jump finds a jump point. A* then runs over
+    the jump points only, with Manhattan distance as heuristic.
+
+    The solution is expanded back into unit ``move(U/D/L/R)`` steps, so the
+    result is a normal `Node` chain. `expanded_nodes` counts expanded jump
+    points, `scanned_cells` the cells visited while jumping, and with
+    ``compare_astar=True`` `astar_expanded_nodes` is the expansion count of
+    `GraphAStar` with `ManhattanHeuristic` on the same problem.
+    """
+
+    def __init__(self, problem, compare_astar=False):
+        super().__init__(problem)
+        self.compare_astar = compare_astar
+        self.expanded_nodes = 0
+        self.scanned_cells = 0
+        self.astar_expanded_nodes = None
+        self.max_fringe_size = 0
+        self._generated_count = 0
+
+    def search(self):
+        """Run JPS and return the goal `Node`, or None if the food is unreachable."""
+        self.expanded_nodes = 0
+        self.scanned_cells = 0
+        self.max_fringe_size = 0
+        self._generated_count = 0
+
+        start_state = self.problem.get_start_states()[0]
+        start, food = start_state
+        self._goal = food
+        self._walls = self.problem.walls
+        self._rows, self._cols = self.problem.rows, self.problem.cols
+
+        if self.compare_astar:
+            self.astar_expanded_nodes = self._astar_expansions()
+
+        if start == food:
+            root = Node(start_state)
+            root.location = "root"
+            self._generated_count = 1
+            return root
+
+        # A* over jump points: (f, count, (pos, g, direction, parent entry))
+        fringe = self.new_fringe(HeapQueue)
+        root = (start, 0, None, None)
+        fringe.push(self._manhattan(start), self._generated_count, root)
+        self._generated_count += 1
+        best_g = {start: 0}
+        closed = set()
+
+        while fringe:
+            _, _, entry = fringe.pop()
+            pos, g, direction, _ = entry
+            if g > best_g[pos] or (pos, direction) in closed:
+                continue
+
+            if pos == food:
+                return self._build_path(start_state, entry)
+
+            closed.add((pos, direction))
+            order = self.expanded_nodes
+            self.expanded_nodes += 1
+
+            for step in self._pruned_directions(pos, direction):
+                jump_point = self._jump(pos, step)
+                if jump_point is None:
+                    continue
+                child_g = g + abs(jump_point[0] - pos[0]) + abs(jump_point[1] - pos[1])
+                if child_g > best_g.get(jump_point, float("inf")):
+                    continue
+                best_g[jump_point] = child_g
+                child = (jump_point, child_g, step, (entry, order))
+                fringe.push(child_g + self._manhattan(jump_point), self._generated_count, child)
+                self._generated_count += 1
+
+            if len(fringe) > self.max_fringe_size:
+                self.max_fringe_size = len(fringe)
+
+        return None
+
+    def report(self):
+        """Jump points expanded next to the equivalent A* figures."""
+        return {
+            "jump_points_expanded": self.expanded_nodes,
+            "cells_scanned": self.scanned_cells,
+            "astar_expanded_nodes": self.astar_expanded_nodes,
+        }
+
+    # Grid helpers
+    ##########################################################################
+
+    def _open(self, r, c):
+        return 0 <= r < self._rows and 0 <= c < self._cols \
+            and not self._walls[r * self._cols + c]
+
+    def _manhattan(self, pos):
+        return abs(pos[0] - self._goal[0]) + abs(pos[1] - self._goal[1])
+
+    def _pruned_directions(self, pos, direction):
+        """Directions worth jumping in after arriving at `pos` via `direction`."""
+        if direction is None:
+            return _ALL_DIRECTIONS
+        _, dr, dc = direction
+        r, c = pos
+        if dr:  # vertical: straight on and both sides
+            return (direction, _LEFT, _RIGHT)
+        # horizontal: straight on and forced vertical turns only
+        steps = [direction]
+        for vertical in (_UP, _DOWN):
+            vr = r + vertical[1]
+            if self._open(vr, c) and not self._open(vr, c - dc):
+                steps.append(vertical)
+        return steps
+
+    def _jump(self, pos, direction):
+        """Follow `direction` from `pos` and return the next jump point."""
+        _, dr, dc = direction
+        if dr:
+            return self._jump_vertical(pos, dr)
+        return self._jump_horizontal(pos, dc)
+
+    def _jump_horizontal(self, pos, dc):
+        r, c = pos
+        while True:
+            c += dc
+            if not self._open(r, c):
+                return None
+            self.scanned_cells += 1
+            if (r, c) == self._goal:
+                return (r, c)
+            for dr in (-1, 1):
+                if self._open(r + dr, c) and not self._open(r + dr, c - dc):
+                    return (r, c)  # forced vertical turn
+
+    def _jump_vertical(self, pos, dr):
+        r, c = pos
+        while True:
+            r += dr
+            if not self._open(r, c):
+                return None
+            self.scanned_cells += 1
+            if (r, c) == self._goal:
+                return (r, c)
+            if self._jump_horizontal((r, c), -1) is not None \
+                    or self._jump_horizontal((r, c), 1) is not None:
+                return (r, c)
+
+    # Solution
+    ##########################################################################
+
+    def _build_path(self, start_state, entry):
+        """Expand the chain of jump points into unit `move` nodes."""
+        segments = []
+        while entry[3] is not None:
+            parent, order = entry[3]
+            segments.append((parent[0], entry[0], entry[2], order))
+            entry = parent
+        segments.reverse()
+
+        _, food = start_state
+        node = Node(start_state)
+        node.location = "root"
+        for (r, c), target, (letter, dr, dc), order in segments:
+            while (r, c) != target:
+                r, c = r + dr, c + dc
+                state = ((r, c), None if (r, c) == food else food)
+                node = Node(state, node, f"move({letter})", node.path_cost + 1)
+                node.expanded_order = order
+                node.set_location(order)
+        return node
+
+    def _astar_expansions(self):
+        from astar import GraphAStar
+
+        def manhattan(state):
+            pos, food = state
+            return 0 if food is None else abs(pos[0] - food[0]) + abs(pos[1] - food[1])
+
+        astar = GraphAStar(self.problem, manhattan)
+        astar.search()
+        return astar.expanded_nodes
+
+    def tree_search(self):
+        """Interface method (JPS is always a graph search)."""
+        return self.search()
@@ -1,4 +1,12 @@
+from array import array
+
+
 class Node:
+    __slots__ = (
+        "state", "parent", "action", "path_cost", "depth",
+        "expanded_order", "_location",
+    )
+
     def __init__(self, state, parent=None, action=None, path_cost=0):
         self.state = state
         self.parent = parent
@@ -6,7 +14,23 @@ class Node:
         self.path_cost = path_cost
         self.depth = parent.depth + 1 if parent else 0
         self.expanded_order = 0
-        self.location = ""
+        self._location = ""
+
+    @property
+    def location(self):
+        """Location label used by the visualizer (built on first access)."""
+        location = self._location
+        if type(location) is int:
+            return f"depth_{self.depth}_node_{location}"
+        return location
+
+    @location.setter
+    def location(self, value):
+        self._location = value
+
+    def set_location(self, order):
+        """Lazily set location to ``depth_<depth>_node_<order>``."""
+        self._location = order
         
     def __lt__(self, other):
         # For heapq to compare nodes when primary keys are equal
@@ -18,4 +42,78 @@ class Node:
         while node:
             path.append(node)
             node = node.parent
-        return list(reversed(path))
\ No newline at end of file
+        return list(reversed(path))
+
+
+class NodePool:
+    """Struct-of-arrays storage for very large search trees.
+
+    Instead of one `Node` object per generated node, the pool keeps the
+    parent index, path cost, depth, action id, expansion order and location
+    of every node in typed `array`s, plus a list with the states. Nodes are
+    referred to by their integer index, and `node(index)` rebuilds the
+    ordinary `Node` chain (with the same attributes the object version
+    would have) only for the nodes that are actually returned.
+    """
+
+    ROOT = -1
+
+    def __init__(self):
+        self.parent = array("q")
+        self.path_cost = array("q")  # switched to "d" on the first float cost
+        self.depth = array("l")
+        self.action = array("l")
+        self.expanded_order = array("q")
+        self.location = array("q")  # ROOT means the literal "root" label
+        self.states = []
+        self._actions = []
+        self._action_ids = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def add(self, state, parent=ROOT, action=None, path_cost=0,
+            expanded_order=0, location=ROOT):
+        """Append a node and return its index."""
+        action_id = self._action_ids.get(action)
+        if action_id is None:
+            action_id = self._action_ids[action] = len(self._actions)
+            self._actions.append(action)
+
+        if type(path_cost) is not int and self.path_cost.typecode == "q":
+            self.path_cost = array("d", self.path_cost)
+
+        self.parent.append(parent)
+        self.path_cost.append(path_cost)
+        self.depth.append(self.depth[parent] + 1 if parent != self.ROOT else 0)
+        self.action.append(action_id)
+        self.expanded_order.append(expanded_order)
+        self.location.append(location)
+        self.states.append(state)
+        return len(self.states) - 1
+
+    def get_action(self, index):
+        return self._actions[self.action[index]]
+
+    def node(self, index):
+        """Materialise the `Node` chain ending at `index`."""
+        chain = []
+        while index != self.ROOT:
+            chain.append(index)
+            index = self.parent[index]
+
+        node = None
+        for index in reversed(chain):
+            node = Node(
+                self.states[index],
+                node,
+                self._actions[self.action[index]],
+                self.path_cost[index],
+            )
+            node.expanded_order = self.expanded_order[index]
+            location = self.location[index]
+            if location == self.ROOT:
+                node.location = "root"
+            else:
+                node.set_location(location)
+        return node
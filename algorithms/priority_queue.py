@@ -0,0 +1,220 @@
+import heapq
+from collections import deque
+
+
+class HeapQueue:
+    """Plain ``heapq`` fringe of ``(priority, count, item)`` entries.
+
+    `count` is the generation counter used as FIFO tie-break, so two items
+    are never compared directly.
+    """
+
+    def __init__(self, entries=()):
+        self._heap = list(entries)
+        heapq.heapify(self._heap)
+        self.max_size = len(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        return iter(self._heap)
+
+    def push(self, priority, count, item):
+        heapq.heappush(self._heap, (priority, count, item))
+        if len(self._heap) > self.max_size:
+            self.max_size = len(self._heap)
+
+    def pop(self):
+        """Remove and return the lowest ``(priority, count, item)``."""
+        return heapq.heappop(self._heap)
+
+    def peek(self):
+        """Return the lowest ``(priority, count, item)`` without removing it."""
+        return self._heap[0]
+
+
+class BucketQueue:
+    """Bucket (radix) fringe for searches whose priorities are small integers.
+
+    Each distinct priority has its own FIFO bucket, so a push is an O(1)
+    append. Only the distinct priorities themselves are kept in a heap, and
+    in A* with unit or small integer costs there are just a handful of
+    them. Since entries are pushed in generation order, popping a bucket
+    left-to-right gives the same order as ``(priority, count)`` in a heap.
+    """
+
+    def __init__(self):
+        self._buckets = {}  # priority -> deque of (count, item)
+        self._priorities = []  # heap of the priorities with a bucket
+        self._size = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for priority, bucket in self._buckets.items():
+            for count, item in bucket:
+                yield priority, count, item
+
+    def push(self, priority, count, item):
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            heapq.heappush(self._priorities, priority)
+        bucket.append((count, item))
+        self._size += 1
+        if self._size > self.max_size:
+            self.max_size = self._size
+
+    def pop(self):
+        """Remove and return the lowest ``(priority, count, item)``."""
+        if not self._size:
+            raise IndexError("pop from an empty bucket queue")
+        priority = self._priorities[0]
+        bucket = self._buckets[priority]
+        count, item = bucket.popleft()
+        if not bucket:
+            del self._buckets[priority]
+            heapq.heappop(self._priorities)
+        self._size -= 1
+        return priority, count, item
+
+
+class IndexedPriorityQueue:
+    """Binary min-heap with a position map and in-place decrease-key.
+
+    Every entry is identified by a hashable key (the search state), so the
+    queue holds at most one entry per key. Priorities are compared as plain
+    Python values; `GraphAStar` uses ``(f, state, generation_count)`` tuples,
+    which keeps the tie-break of its ``heapq`` version.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._priorities = []
+        self._items = []
+        self._position = {}  # key -> index in the heap arrays
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __bool__(self):
+        return bool(self._keys)
+
+    def __contains__(self, key):
+        return key in self._position
+
+    def priority(self, key):
+        """Return the current priority of `key`."""
+        return self._priorities[self._position[key]]
+
+    def get(self, key, default=None):
+        """Return the item stored under `key`, or `default`."""
+        index = self._position.get(key)
+        if index is None:
+            return default
+        return self._items[index]
+
+    def push(self, key, priority, item):
+        """Insert `item` under `key`, or decrease its priority.
+
+        Returns True if the queue changed: the key was new, or `priority`
+        is lower than the stored one (the stored item is then replaced).
+        """
+        index = self._position.get(key)
+        if index is not None:
+            if not priority < self._priorities[index]:
+                return False
+            self._priorities[index] = priority
+            self._items[index] = item
+            self._sift_up(index)
+            return True
+
+        index = len(self._keys)
+        self._keys.append(key)
+        self._priorities.append(priority)
+        self._items.append(item)
+        self._position[key] = index
+        self._sift_up(index)
+        if index + 1 > self.max_size:
+            self.max_size = index + 1
+        return True
+
+    def decrease_key(self, key, priority, item=None):
+        """Lower the priority of an existing `key` in O(log n)."""
+        index = self._position[key]
+        if priority > self._priorities[index]:
+            raise ValueError("decrease_key cannot increase a priority")
+        self._priorities[index] = priority
+        if item is not None:
+            self._items[index] = item
+        self._sift_up(index)
+
+    def pop(self):
+        """Remove and return the ``(priority, key, item)`` with lowest priority."""
+        if not self._keys:
+            raise IndexError("pop from an empty priority queue")
+        key = self._keys[0]
+        priority = self._priorities[0]
+        item = self._items[0]
+        del self._position[key]
+
+        last_key = self._keys.pop()
+        last_priority = self._priorities.pop()
+        last_item = self._items.pop()
+        if self._keys:
+            self._keys[0] = last_key
+            self._priorities[0] = last_priority
+            self._items[0] = last_item
+            self._position[last_key] = 0
+            self._sift_down(0)
+        return priority, key, item
+
+    def _sift_up(self, index):
+        keys, priorities, items, position = (
+            self._keys, self._priorities, self._items, self._position
+        )
+        key, priority, item = keys[index], priorities[index], items[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not priority < priorities[parent]:
+                break
+            keys[index] = keys[parent]
+            priorities[index] = priorities[parent]
+            items[index] = items[parent]
+            position[keys[index]] = index
+            index = parent
+        keys[index], priorities[index], items[index] = key, priority, item
+        position[key] = index
+
+    def _sift_down(self, index):
+        keys, priorities, items, position = (
+            self._keys, self._priorities, self._items, self._position
+        )
+        size = len(keys)
+        key, priority, item = keys[index], priorities[index], items[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and priorities[right] < priorities[child]:
+                child = right
+            if not priorities[child] < priority:
+                break
+            keys[index] = keys[child]
+            priorities[index] = priorities[child]
+            items[index] = items[child]
+            position[keys[index]] = index
+            index = child
+        keys[index], priorities[index], items[index] = key, priority, item
+        position[key] = index
@@ -0,0 +1,119 @@
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def current_rss_kb():
+    """Resident set size of this process in KiB (peak RSS where unknown)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class ProgressReporter:
+    """Progress events of a long search, every `every` expansions or
+    `interval` seconds (whichever comes first; None disables either).
+
+    The algorithms call `start` when a search begins and then `check`
+    whenever ``expanded_nodes`` reaches `next_check`, so between checks the
+    cost is one integer comparison per expansion; the clock is only read
+    every `check_every` expansions. Each event is a dict::
+
+        {"event": "progress", "label": ..., "algorithm": "TreeAStar",
+         "bound_kind": "f", "bound": 42, "expanded": 120000,
+         "fringe": 5310, "elapsed": 3.1, "nodes_per_second": 38709.7,
+         "rss_kb": 81234}
+
+    where the bound is the f of the node being expanded for A* and the
+    depth limit for IDS. Events go to `callback` and/or are appended as
+    one JSON line each to the file `path` (opened per event, so the file
+    is complete up to the last event even if the process is killed).
+    """
+
+    def __init__(self, callback=None, path=None, every=10000, interval=5.0,
+                 check_every=1000, label=None):
+        if every is None and interval is None:
+            raise ValueError("ProgressReporter needs `every` or `interval`")
+        self.callback = callback
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self.check_every = check_every
+        self.label = label
+        self.events = 0
+        self.next_check = 0
+        self._algorithm = None
+        self._bound_kind = None
+        self._start_time = None
+        self._next_report = None
+        self._next_time = None
+
+    def start(self, algorithm, bound_kind):
+        """Reset the counters and the clock for a new search."""
+        self._algorithm = type(algorithm).__name__
+        self._bound_kind = bound_kind
+        self._start_time = time.perf_counter()
+        self._next_report = self.every
+        self._next_time = None if self.interval is None else self._start_time + self.interval
+        self.events = 0
+        self.next_check = self._schedule(0)
+
+    def check(self, expanded, bound, fringe_size):
+        """Emit an event if `every` expansions or `interval` seconds passed."""
+        if self._start_time is None:
+            raise RuntimeError("ProgressReporter.check() called before start()")
+        now = time.perf_counter()
+        if ((self._next_report is not None and expanded >= self._next_report)
+                or (self._next_time is not None and now >= self._next_time)):
+            self.emit(self._event(expanded, bound, fringe_size, now))
+            if self.every is not None:
+                self._next_report = expanded + self.every
+            if self.interval is not None:
+                self._next_time = now + self.interval
+        self.next_check = self._schedule(expanded)
+
+    def emit(self, event):
+        self.events += 1
+        if self.callback is not None:
+            self.callback(event)
+        if self.path is not None:
+            with open(self.path, "a") as fh:
+                fh.write(json.dumps(event) + "\n")
+
+    def _schedule(self, expanded):
+        """Expansion count at which `check` has to be called next."""
+        if self.interval is None:
+            return self._next_report
+        next_check = expanded + self.check_every
+        if self._next_report is not None:
+            next_check = min(next_check, self._next_report)
+        return next_check
+
+    def _event(self, expanded, bound, fringe_size, now):
+        elapsed = now - self._start_time
+        return {
+            "event": "progress",
+            "label": self.label,
+            "algorithm": self._algorithm,
+            "bound_kind": self._bound_kind,
+            "bound": bound,
+            "expanded": expanded,
+            "fringe": fringe_size,
+            "elapsed": round(elapsed, 6),
+            "nodes_per_second": round(expanded / elapsed, 1) if elapsed else None,
+            "rss_kb": current_rss_kb(),
+        }
@@ -1,10 +1,77 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from node import Node
+
+
 class SearchAlgorithm:
+    # Hook points of `instrumentation`: the search loops sort successors,
+    # build nodes and create fringes through these, so an instrumented run
+    # can swap timed versions in on its own instance only.
+    sort = sorted
+    node_class = Node
+
+    # Optional `ProgressReporter`, `SearchBudget` and `Checkpointer` of the
+    # algorithms that support them (see `_tick`)
+    progress = None
+    budget = None
+    checkpoint = None
+    _next_tick = 0
+
     def __init__(self, problem):
         self.problem = problem
         self.expanded_nodes = 0
+        self.stats = None
         
     def search(self):
         raise NotImplementedError("Subclasses must implement search method")
         
     def tree_search(self):
-        return self.search()
\ No newline at end of file
+        return self.search()
+
+    def new_fringe(self, cls, *args):
+        """A new ``cls(*args)`` fringe (priority queue) for the search."""
+        return cls(*args)
+
+    def _schedule_tick(self):
+        """Set `_next_tick` to the earliest ``next_check`` of progress,
+        budget and checkpoint (never, if there is none of them)."""
+        self._next_tick = min(
+            (hook.next_check for hook in (self.progress, self.budget, self.checkpoint)
+             if hook is not None),
+            default=float("inf"),
+        )
+
+    def _tick(self, count, bound, fringe_len, snapshot=None):
+        """Progress, budget and checkpoint checks of the search loops.
+
+        The loops call it once `count` (their expansion counter) reaches
+        `_next_tick`, so in between the cost is one comparison per
+        expansion. `bound` is the f or depth bound reported to progress and
+        budget, and `snapshot` builds the state the `Checkpointer` saves.
+        """
+        progress, budget, checkpoint = self.progress, self.budget, self.checkpoint
+        if progress is not None and count >= progress.next_check:
+            progress.check(count, bound, fringe_len)
+        if budget is not None and count >= budget.next_check:
+            budget.check(count, bound, fringe_len)
+        if checkpoint is not None and count >= checkpoint.next_check:
+            checkpoint.check(count, snapshot)
+        self._schedule_tick()
+
+    def search_with_stats(self, profile=None):
+        """Run `search()` with per-phase timers and counters.
+
+        Returns ``(result, stats)`` where `stats` is an
+        `instrumentation.SearchStats` (also kept in ``self.stats``). Plain
+        `search()` calls are not touched, so they pay nothing for this.
+        With `profile` set to a path a cProfile/pstats dump is written too.
+        """
+        from instrumentation import search_with_stats
+
+        result, self.stats = search_with_stats(self, profile)
+        return result, self.stats
\ No newline at end of file
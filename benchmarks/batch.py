@@ -0,0 +1,246 @@
+"""Batch runner for evaluation sweeps over layouts, seeds and algorithms.
+
+Fans a job matrix out over a `concurrent.futures` process pool instead of
+one ``hlogedu-search run`` per job, so interpreter start-up is paid once
+per worker and each Pacman layout is loaded once per worker and reused by
+all the jobs that need it.
+Results are appended to one JSON Lines file as the jobs finish.
+
+    python benchmarks/batch.py --out results.jsonl
+    python benchmarks/batch.py --pacman graph-astar:Manhattan jps --no-nqueens
+    python benchmarks/batch.py --no-pacman --n-queens 6 8 --seeds 1 2 3 4 5
+    python benchmarks/batch.py --matrix jobs.json --workers 8 --timeout 600
+
+Jobs use the format of `bench.py` (see `bench.job`). Each job has its own
+time limit; a job that exceeds it is stopped with ``SIGALRM`` inside its
+worker and reported with status ``timeout``, and the worker moves on to
+the next job. Where ``SIGALRM`` does not exist (Windows) the limit is not
+enforced. The exit status is 1 if any job errored or timed out.
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import signal
+import sys
+import time
+
+import bench
+
+from progress import current_rss_kb
+
+# Algorithms of the default sweep as (algorithm, heuristic)
+PACMAN_ALGORITHMS = [("graph-astar", "Manhattan"), ("jps", None)]
+NQUEENS_ALGORITHMS = [("graph-astar", "RepairHeuristic")]
+
+
+# Matrix
+##############################################################################
+
+
+def sweep_matrix(pacman_algorithms=PACMAN_ALGORITHMS, nqueens_algorithms=NQUEENS_ALGORITHMS,
+                 n_values=(4, 5, 6), seeds=(123, 1, 2)):
+    """The classic mazes and every wc3 map with `pacman_algorithms`, plus
+    NQueensIR for every ``(n_queens, seed)`` with `nqueens_algorithms`.
+
+    Jobs of the same problem instance are next to each other, so a worker
+    usually picks up several jobs of the layout it has already loaded.
+    """
+    jobs = []
+    layouts = sorted(glob.glob(os.path.join(bench.LAYOUTS_DIR, "*.lay")))
+    layouts += sorted(glob.glob(os.path.join(bench.LAYOUTS_DIR, "wc3", "*.lay")))
+    for layout in layouts:
+        params = {"file": os.path.relpath(layout, bench.ROOT)}
+        for algorithm, heuristic in pacman_algorithms:
+            jobs.append(bench.job("pacman", params, algorithm, heuristic))
+    for n_queens in n_values:
+        for seed in seeds:
+            params = {"n_queens": n_queens, "seed": seed}
+            for algorithm, heuristic in nqueens_algorithms:
+                jobs.append(bench.job("nqueens", params, algorithm, heuristic))
+    return jobs
+
+
+def parse_algorithm(text):
+    """``"graph-astar:Manhattan"`` -> ``("graph-astar", "Manhattan")``."""
+    algorithm, _, heuristic = text.partition(":")
+    return algorithm, heuristic or None
+
+
+# Worker side
+##############################################################################
+
+# Problems whose instances are reused by the jobs of a worker. NQueensIR is
+# not: it seeds `random` in its constructor and draws a new board on every
+# get_start_states() call, so a shared instance gives each job another start.
+CACHED_PROBLEMS = {"pacman"}
+
+# Problems and heuristics already built by this worker, by instance key
+_problems = {}
+_heuristics = {}
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def _init_worker():
+    # Before the worker imports the problems (and with them pygame), as
+    # `bench.run_in_subprocess` does for its job processes
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+
+def _instance_key(entry):
+    return entry["problem"], json.dumps(entry["params"], sort_keys=True)
+
+
+def _get_problem(entry):
+    """Problem and heuristic of `entry`, built once per worker for the
+    problems of `CACHED_PROBLEMS` and once per job for the rest."""
+    if entry["problem"] not in CACHED_PROBLEMS:
+        return bench._make_problem(entry)
+
+    key = _instance_key(entry)
+    problem = _problems.get(key)
+    if problem is None:
+        problem, _ = bench._make_problem(dict(entry, heuristic=None))
+        _problems[key] = problem
+
+    heuristic = None
+    if entry["heuristic"]:
+        heuristic_key = key + (entry["heuristic"],)
+        heuristic = _heuristics.get(heuristic_key)
+        if heuristic is None:
+            module, _ = bench.PROBLEMS[entry["problem"]]
+            heuristic = bench._find_heuristic(module, entry["heuristic"])(problem)
+            _heuristics[heuristic_key] = heuristic
+    return problem, heuristic
+
+
+def run_batch_job(entry, timeout):
+    """Run `entry` in this worker and return its result record.
+
+    ``peak_rss_kb`` is left empty since the worker is shared by many jobs;
+    ``worker_rss_kb`` is the worker's resident memory after the job.
+    """
+    result = bench._failed(entry, None, None)
+    result["worker"] = os.getpid()
+    alarm = timeout and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        problem, heuristic = _get_problem(entry)
+        if entry["algorithm"].startswith("hlog-"):
+            result.update(bench._run_framework_algorithm(entry, problem, heuristic))
+        else:
+            result.update(bench._run_repo_algorithm(entry, problem, heuristic))
+        result["status"] = "ok" if result["cost"] is not None else "no-solution"
+    except JobTimeout:
+        result["status"] = "timeout"
+        result["error"] = f"more than {timeout}s"
+        result["time"] = time.perf_counter() - start
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result["worker_rss_kb"] = current_rss_kb()
+    return result
+
+
+# Running the matrix
+##############################################################################
+
+
+def run_batch(jobs, out, workers=None, timeout=300, log=sys.stderr):
+    """Run `jobs` on a pool of `workers` processes.
+
+    Every result is written to `out` (a JSON Lines path) as soon as its job
+    finishes, in completion order. Returns the results in `jobs` order.
+    """
+    results = [None] * len(jobs)
+    done = 0
+    with open(out, "w") as fh, \
+            concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                   initializer=_init_worker) as pool:
+        futures = {pool.submit(run_batch_job, entry, timeout): i
+                   for i, entry in enumerate(jobs)}
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # the worker died (e.g. killed by the OOM killer)
+                result = bench._failed(jobs[i], "error", f"{type(e).__name__}: {e}")
+            results[i] = result
+            fh.write(json.dumps(result) + "\n")
+            fh.flush()
+            done += 1
+            if log is not None:
+                time_text = f"{result['time']:.3f}s" if result["time"] is not None else "-"
+                print(f"[{done}/{len(jobs)}] {result['id']}: {result['status']} "
+                      f"{time_text} expanded={result['expanded']}", file=log)
+    return results
+
+
+# Command line
+##############################################################################
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matrix", help="JSON file with a list of jobs to run instead "
+                                         "of the sweep below.")
+    parser.add_argument("--pacman", nargs="+", metavar="ALG[:HEURISTIC]",
+                        help="Algorithms for every maze and wc3 map "
+                             "(default: graph-astar:Manhattan jps).")
+    parser.add_argument("--no-pacman", action="store_true", help="Skip the Pacman layouts.")
+    parser.add_argument("--nqueens", nargs="+", metavar="ALG[:HEURISTIC]",
+                        help="Algorithms for NQueensIR (default: graph-astar:RepairHeuristic).")
+    parser.add_argument("--no-nqueens", action="store_true", help="Skip NQueensIR.")
+    parser.add_argument("--n-queens", nargs="+", type=int, default=[4, 5, 6],
+                        help="Board sizes of NQueensIR (default: 4 5 6).")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[123, 1, 2],
+                        help="Seeds of NQueensIR (default: 123 1 2).")
+    parser.add_argument("--filter", default="",
+                        help="Only run jobs whose id contains this text.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Time limit per job in seconds (default: 300).")
+    parser.add_argument("--out", default="results.jsonl",
+                        help="JSON Lines file for the results (default: results.jsonl).")
+    parser.add_argument("--csv", help="Also write the results to this CSV file.")
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        with open(args.matrix) as fh:
+            jobs = json.load(fh)
+    else:
+        pacman = [] if args.no_pacman else (
+            [parse_algorithm(a) for a in args.pacman] if args.pacman else PACMAN_ALGORITHMS)
+        nqueens = [] if args.no_nqueens else (
+            [parse_algorithm(a) for a in args.nqueens] if args.nqueens else NQUEENS_ALGORITHMS)
+        jobs = sweep_matrix(pacman, nqueens, args.n_queens, args.seeds)
+    if args.filter:
+        jobs = [j for j in jobs if args.filter in bench.job_id(j)]
+
+    results = run_batch(jobs, args.out, args.workers, args.timeout)
+    if args.csv:
+        bench.write_csv(args.csv, results)
+
+    failed = sum(r["status"] in ("error", "timeout") for r in results)
+    print(f"{len(results)} jobs, {failed} failed or timed out; results in {args.out}",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
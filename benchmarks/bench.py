@@ -0,0 +1,473 @@
+"""Benchmark harness for the problems and algorithms of this repository.
+
+Runs a matrix of (problem, algorithm, heuristic) jobs, each one in its own
+Python process so that peak RSS is measured per job, and records wall time
+of the search, peak RSS, expanded and generated nodes, peak fringe size,
+solution cost and length.
+
+    python benchmarks/bench.py --only kiwis nqueens --json out.json --csv out.csv
+    python benchmarks/bench.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+    python benchmarks/bench.py --only kiwis nqueens --update-readme
+
+With ``--baseline`` the run is compared against a saved result file and the
+exit status is 1 if any job regressed (see `find_regressions`).
+"""
+
+import argparse
+import csv
+import glob
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALGORITHMS_DIR = os.path.join(ROOT, "algorithms")
+PROBLEMS_DIR = os.path.join(ROOT, "problems")
+LAYOUTS_DIR = os.path.join(PROBLEMS_DIR, "layouts")
+README = os.path.join(ROOT, "readme.md")
+
+for path in (ALGORITHMS_DIR, PROBLEMS_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# name -> (module, class)
+PROBLEMS = {
+    "pacman": ("pacman", "PacmanProblem"),
+    "nqueens": ("nqueens", "NQueensIterativeRepair"),
+    "kiwis": ("kiwis_and_dogs", "KiwisAndDogsProblem"),
+}
+
+# name -> (module, class, takes a heuristic)
+ALGORITHMS = {
+    "tree-ids": ("ids", "TreeIDS", False),
+    "ida-star": ("idastar", "IDAStar", True),
+    "tree-astar": ("astar", "TreeAStar", True),
+    "graph-astar": ("astar", "GraphAStar", True),
+    "bidirectional": ("bidirectional", "BidirectionalSearch", False),
+    "jps": ("jps", "JumpPointSearch", False),
+}
+
+TREE_SEARCH_LAYOUTS = {"testMaze.lay", "tinyMaze.lay", "smallMaze.lay", "contoursMaze.lay"}
+
+RESULT_FIELDS = [
+    "id", "problem", "params", "algorithm", "heuristic", "status", "time",
+    "peak_rss_kb", "expanded", "generated", "max_fringe", "cost", "length", "error",
+]
+
+
+# Matrix
+##############################################################################
+
+
+def job(problem, params, algorithm, heuristic=None, table=None, label=None):
+    """One benchmark job. `table`/`label` place it in a readme table."""
+    entry = {
+        "problem": problem,
+        "params": params,
+        "algorithm": algorithm,
+        "heuristic": heuristic,
+    }
+    if table:
+        entry["table"] = table
+        entry["label"] = label or algorithm
+    return entry
+
+
+def job_id(entry):
+    params = ",".join(f"{k}={v}" for k, v in sorted(entry["params"].items()))
+    return f"{entry['problem']}[{params}]:{entry['algorithm']}:{entry['heuristic'] or '-'}"
+
+
+def default_matrix():
+    """Every problem instance of the repository with its relevant algorithms."""
+    jobs = []
+
+    # Kiwis and dogs (readme section 2.1)
+    for algorithm, label in (("hlog-graph-bfs", "**BFS**"),
+                             ("hlog-graph-dfs", "**DFS**"),
+                             ("hlog-graph-ucs", "**UCS**")):
+        jobs.append(job("kiwis", {}, algorithm, table="kiwis", label=label))
+    for params in ({}, {"file": os.path.join("problems", "kiwis", "grid12.json")}):
+        jobs.append(job("kiwis", params, "graph-astar", "ShortestPath"))
+        jobs.append(job("kiwis", params, "bidirectional"))
+        jobs.append(job("kiwis", dict(params, packed=1), "graph-astar", "ShortestPath"))
+    jobs.append(job("kiwis", {}, "tree-astar", "ShortestPath"))
+
+    # N-Queens iterative repair (readme section 2.2)
+    for algorithm, heuristic, label in (
+        ("hlog-graph-ucs", None, "**`graph-ucs`**"),
+        ("hlog-graph-astar", "RepairHeuristic", "**`graph-astar`**"),
+        ("hlog-tree-ucs", None, "**`tree-ucs`**"),
+        ("hlog-tree-astar", "RepairHeuristic", "**`tree-astar`**"),
+    ):
+        jobs.append(job("nqueens", {"n_queens": 4, "seed": 123}, algorithm, heuristic,
+                        table="nqueens-4-123", label=label))
+    for n_queens in (4, 5, 6):
+        for seed in (123, 1, 2):
+            params = {"n_queens": n_queens, "seed": seed}
+            jobs.append(job("nqueens", params, "tree-astar", "RepairHeuristic"))
+            jobs.append(job("nqueens", params, "graph-astar", "RepairHeuristic"))
+            jobs.append(job("nqueens", params, "hlog-graph-astar", "RepairHeuristic"))
+            if n_queens == 4:
+                jobs.append(job("nqueens", params, "tree-ids"))
+
+    # Pacman: every layout, wc3 maps included. Tree A* re-expands every
+    # cycle of the maze, so it only runs on the small layouts.
+    layouts = sorted(glob.glob(os.path.join(LAYOUTS_DIR, "*.lay")))
+    layouts += sorted(glob.glob(os.path.join(LAYOUTS_DIR, "wc3", "*.lay")))
+    for layout in layouts:
+        params = {"file": os.path.relpath(layout, ROOT)}
+        jobs.append(job("pacman", params, "graph-astar", "Manhattan"))
+        jobs.append(job("pacman", params, "hlog-graph-astar", "Manhattan"))
+        jobs.append(job("pacman", params, "jps"))
+        jobs.append(job("pacman", params, "bidirectional"))
+        if os.path.basename(layout) in TREE_SEARCH_LAYOUTS:
+            jobs.append(job("pacman", params, "tree-astar", "Manhattan"))
+    return jobs
+
+
+# Running one job (inside the worker process)
+##############################################################################
+
+
+def _load_class(module, name):
+    return getattr(importlib.import_module(module), name)
+
+
+def _find_heuristic(module, name):
+    """Heuristic class of `module` whose NAME (or class name) is `name`."""
+    from hlogedu.search.problem import Heuristic
+
+    for value in vars(importlib.import_module(module)).values():
+        if (isinstance(value, type) and issubclass(value, Heuristic)
+                and name in (getattr(value, "NAME", None), value.__name__)):
+            return value
+    raise ValueError(f"Unknown heuristic {name!r} for {module}")
+
+
+def _make_problem(entry):
+    module, name = PROBLEMS[entry["problem"]]
+    params = dict(entry["params"])
+    if "file" in params and not os.path.isabs(params["file"]):
+        params["file"] = os.path.join(ROOT, params["file"])
+    problem = _load_class(module, name)(**params)
+    heuristic = None
+    if entry["heuristic"]:
+        heuristic = _find_heuristic(module, entry["heuristic"])(problem)
+    return problem, heuristic
+
+
+def _run_repo_algorithm(entry, problem, heuristic):
+    module, name, informed = ALGORITHMS[entry["algorithm"]]
+    cls = _load_class(module, name)
+    algorithm = cls(problem, heuristic) if informed else cls(problem)
+
+    start = time.perf_counter()
+    node = algorithm.search()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "time": elapsed,
+        "expanded": algorithm.expanded_nodes,
+        "generated": getattr(algorithm, "_generated_count", None),
+        "max_fringe": getattr(algorithm, "max_fringe_size", None),
+    }
+    if node is not None:
+        result["cost"] = node.path_cost
+        result["length"] = len(node.path())
+    return result
+
+
+def _run_framework_algorithm(entry, problem, heuristic):
+    import hlogedu.search.default_algorithms  # noqa: F401 (registers hlog-*)
+    from hlogedu.search.algorithm import get_algorithm
+
+    algorithm = get_algorithm(entry["algorithm"])(problem)
+    kwargs = {"max_depth": sys.maxsize}
+    if heuristic is not None:
+        kwargs["heuristic"] = heuristic
+
+    start = time.perf_counter()
+    solution = algorithm.run(**kwargs)
+    elapsed = time.perf_counter() - start
+
+    # Walk the search tree the framework keeps for its outputters
+    expanded = generated = 0
+    stack = list(solution.root_nodes)
+    while stack:
+        node = stack.pop()
+        generated += 1
+        if node.location.name == "EXPANDED":
+            expanded += 1
+        stack.extend(node.successors)
+
+    result = {
+        "time": elapsed,
+        "expanded": expanded,
+        "generated": generated - len(solution.root_nodes),
+        "max_fringe": algorithm.fringe.max_size,
+    }
+    if solution.has_solution():
+        path = solution.get_solution_path()
+        result["cost"] = path[-1].cost
+        result["length"] = len(path)
+    return result
+
+
+def run_job(entry):
+    """Run `entry` in this process and return its result record."""
+    result = {field: None for field in RESULT_FIELDS}
+    result.update(
+        id=job_id(entry),
+        problem=entry["problem"],
+        params=entry["params"],
+        algorithm=entry["algorithm"],
+        heuristic=entry["heuristic"],
+    )
+    try:
+        problem, heuristic = _make_problem(entry)
+        if entry["algorithm"].startswith("hlog-"):
+            result.update(_run_framework_algorithm(entry, problem, heuristic))
+        else:
+            result.update(_run_repo_algorithm(entry, problem, heuristic))
+        result["status"] = "ok" if result["cost"] is not None else "no-solution"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux (bytes on macOS)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["peak_rss_kb"] = rss // 1024 if sys.platform == "darwin" else rss
+    return result
+
+
+# Running the matrix
+##############################################################################
+
+
+def run_in_subprocess(entry, timeout):
+    """Run `entry` in a fresh interpreter; returns its result record."""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    command = [sys.executable, os.path.abspath(__file__), "--job", json.dumps(entry)]
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True,
+                              timeout=timeout, env=env)
+    except subprocess.TimeoutExpired:
+        return _failed(entry, "timeout", f"more than {timeout}s")
+
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = proc.stderr.strip().splitlines()[-1:] or [f"exit status {proc.returncode}"]
+        return _failed(entry, "error", error[0])
+    return json.loads(lines[-1])
+
+
+def _failed(entry, status, error):
+    result = {field: None for field in RESULT_FIELDS}
+    result.update(
+        id=job_id(entry), problem=entry["problem"], params=entry["params"],
+        algorithm=entry["algorithm"], heuristic=entry["heuristic"],
+        status=status, error=error,
+    )
+    return result
+
+
+def run_matrix(jobs, timeout, log=sys.stderr):
+    results = []
+    for i, entry in enumerate(jobs, 1):
+        result = run_in_subprocess(entry, timeout)
+        if "table" in entry:
+            result["table"], result["label"] = entry["table"], entry["label"]
+        results.append(result)
+        if log is not None:
+            time_text = f"{result['time']:.3f}s" if result["time"] is not None else "-"
+            print(f"[{i}/{len(jobs)}] {result['id']}: {result['status']} "
+                  f"{time_text} expanded={result['expanded']}", file=log)
+    return results
+
+
+# Output
+##############################################################################
+
+
+def write_json(path, results):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(results, fh, indent=2)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+def write_csv(path, results):
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            row = dict(result, params=json.dumps(result["params"], sort_keys=True))
+            writer.writerow(row)
+
+
+def find_regressions(results, baseline, time_tolerance=0.25, rss_tolerance=0.25,
+                     min_time=0.05):
+    """Compare `results` with `baseline` (both lists of result records).
+
+    A job regresses if it no longer finds a solution, finds a different
+    cost, expands more nodes, or takes more than `time_tolerance` (and at
+    least `min_time` seconds) more time, or `rss_tolerance` more memory.
+    Returns a list of ``(id, reason)``.
+    """
+    previous = {r["id"]: r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(result["id"])
+        if old is None or old["status"] != "ok":
+            continue
+        if result["status"] != "ok":
+            regressions.append((result["id"], f"status {result['status']}"))
+            continue
+        if result["cost"] != old["cost"]:
+            regressions.append((result["id"], f"cost {old['cost']} -> {result['cost']}"))
+        if result["expanded"] > old["expanded"]:
+            regressions.append(
+                (result["id"], f"expanded {old['expanded']} -> {result['expanded']}"))
+        if (result["time"] > old["time"] * (1 + time_tolerance)
+                and result["time"] - old["time"] >= min_time):
+            regressions.append(
+                (result["id"], f"time {old['time']:.3f}s -> {result['time']:.3f}s"))
+        if (old["peak_rss_kb"] and result["peak_rss_kb"]
+                and result["peak_rss_kb"] > old["peak_rss_kb"] * (1 + rss_tolerance)):
+            regressions.append(
+                (result["id"], f"rss {old['peak_rss_kb']} -> {result['peak_rss_kb']} KiB"))
+    return regressions
+
+
+def render_table(results):
+    """Markdown table in the format of the readme."""
+    lines = [
+        "| Algoritmo | Max fringe size | Solution Cost | Solution Length "
+        "| Search nodes expanded | Time (s) | Peak RSS (MB) |",
+        "| :--- | :--- | :--- | :--- | :--- | :--- | :--- |",
+    ]
+    for r in results:
+        rss = f"{r['peak_rss_kb'] / 1024:.1f}" if r["peak_rss_kb"] else "-"
+        if r["status"] in ("ok", "no-solution"):
+            time_text = f"{r['time']:.3f}"
+        else:
+            time_text = r["status"]
+        lines.append(
+            f"| {r['label']} | {_cell(r['max_fringe'])} | {_cell(r['cost'])} "
+            f"| {_cell(r['length'])} | {_cell(r['expanded'])} | {time_text} | {rss} |"
+        )
+    return "\n".join(lines)
+
+
+def _cell(value):
+    return "-" if value is None else str(value)
+
+
+def update_readme(results, path=README):
+    """Rewrite the tables between ``<!-- bench:NAME -->`` and
+    ``<!-- /bench:NAME -->`` markers with the jobs tagged ``table=NAME``.
+    Returns the names of the tables whose content changed; the file is
+    only written if there is one, so its mtime is left alone otherwise.
+    Tables without markers in the file are skipped. A table whose markers
+    appear more than once raises ValueError and nothing is written."""
+    tables = {}
+    for result in results:
+        if result.get("table"):
+            tables.setdefault(result["table"], []).append(result)
+
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    updated = []
+    for name, rows in tables.items():
+        begin, end = f"<!-- bench:{name} -->", f"<!-- /bench:{name} -->"
+        if text.count(begin) > 1 or text.count(end) > 1:
+            raise ValueError(f"Markers of table {name!r} appear more than once in {path}")
+        start = text.find(begin)
+        stop = text.find(end, start)
+        if start < 0 or stop < 0:
+            continue
+        new_text = text[:start + len(begin)] + "\n" + render_table(rows) + "\n" + text[stop:]
+        if new_text != text:
+            text = new_text
+            updated.append(name)
+
+    if updated:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    return updated
+
+
+# Command line
+##############################################################################
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(PROBLEMS),
+                        help="Only run jobs of these problems.")
+    parser.add_argument("--filter", default="",
+                        help="Only run jobs whose id contains this text.")
+    parser.add_argument("--matrix", help="JSON file with a list of jobs to run instead "
+                                         "of the default matrix.")
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Time limit per job in seconds (default: 300).")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    parser.add_argument("--csv", help="Write the results to this CSV file.")
+    parser.add_argument("--baseline", help="Compare with this result file and exit "
+                                           "with status 1 on regressions.")
+    parser.add_argument("--save-baseline", help="Write the results as a new baseline.")
+    parser.add_argument("--update-readme", action="store_true",
+                        help="Regenerate the result tables of readme.md.")
+    parser.add_argument("--job", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.job:
+        print(json.dumps(run_job(json.loads(args.job))))
+        return 0
+
+    if args.matrix:
+        with open(args.matrix) as fh:
+            jobs = json.load(fh)
+    else:
+        jobs = default_matrix()
+    if args.only:
+        jobs = [j for j in jobs if j["problem"] in args.only]
+    if args.filter:
+        jobs = [j for j in jobs if args.filter in job_id(j)]
+
+    results = run_matrix(jobs, args.timeout)
+
+    if args.json:
+        write_json(args.json, results)
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+    if args.update_readme:
+        for name in update_readme(results):
+            print(f"readme table {name!r} updated", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        regressions = find_regressions(results, baseline)
+        for job_name, reason in regressions:
+            print(f"REGRESSION {job_name}: {reason}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
-from dataclasses import dataclass
+import json
 
-from hlogedu.search.problem import Problem, action, Categorical, DDRange
+from dataclasses import dataclass, field
+
+from hlogedu.search.common import ClassParameter
+from hlogedu.search.problem import Problem, action, DCategorical, DDRange, Heuristic
 
 
 @dataclass(frozen=True, order=True)
 class State:
     kiwis: tuple[str, ...]
     dogs: tuple[str, ...]
+    # Bitmask of occupied vertices, filled in by the problem on first use.
+    # Not part of equality, hashing or ordering.
+    occupancy: int = field(default=None, compare=False, repr=False)
 
 
 # Problem
@@ -14,10 +20,40 @@ class State:
 
 
 class KiwisAndDogsProblem(Problem):
-    NAME = "kiwis-and-dogs"
+    """Kiwis and dogs moving over a graph with conditional edges.
+
+    The instance (graph, coordinates, agents, start and goal vertices) is
+    plain data: the built-in one below, or a JSON file given with `file`
+    (see `load_instance`). The actions are generated from the edge table:
+    `move_kiwi(edge, idx)` and `move_dog(edge, idx)` with edges named
+    ``"X_to_Y"``, and their cost is the cost of the edge.
+
+    With ``packed=1`` states are canonical integers instead of `State`
+    objects (see `pack`): kiwis are interchangeable, and so are dogs, so
+    only the multisets of their vertices are kept. This shrinks the state
+    space by up to k! for k kiwis, and hashing and ordering become integer
+    operations. `unpack` turns a packed state back into a `State`.
+    """
 
-    def __init__(self):
+    NAME = "kiwis-and-dogs"
+    PARAMS = [
+        ClassParameter(
+            "file",
+            type=str,
+            default="",
+            help="JSON file with the instance (default: the built-in graph).",
+        ),
+        ClassParameter(
+            "packed",
+            type=int,
+            default="0",
+            help="1 = canonical integer states (interchangeable kiwis/dogs).",
+        ),
+    ]
+
+    def __init__(self, file: str = "", packed: int = 0):
         super().__init__()
+        self.packed = bool(packed)
 
         self.vtree = "A"   
         self.vbone = "E"
@@ -62,16 +98,219 @@ class KiwisAndDogsProblem(Problem):
         }
         self.num_kiwis = 2
         self.num_dogs = 1
+        self.start_kiwis = ("D", "F")
+        self.start_dogs = ("C",)
+
+        if file:
+            self.load_instance(file)
+        self._compile()
+
+    def load_instance(self, path):
+        """Replace the instance with the one in the JSON file `path`.
+
+        Format::
+
+            {
+              "coordinates": {"A": [0, 0], "B": [1, 1], ...},
+              "edges": [["A", "B", 3, "nobody(E)"], ["A", "C", 4, ""], ...],
+              "kiwis": ["D", "F"],
+              "dogs": ["C"],
+              "tree": "A",
+              "bone": "E"
+            }
+
+        Edges are directed; `kiwis` and `dogs` are the start vertices, so
+        they also give the number of agents.
+        """
+        with open(path) as fh:
+            data = json.load(fh)
+        try:
+            self.coordinates = {v: tuple(xy) for v, xy in data["coordinates"].items()}
+            self.graph = {
+                (u, v): (cost, conditions)
+                for u, v, cost, conditions in data["edges"]
+            }
+            self.start_kiwis = tuple(data["kiwis"])
+            self.start_dogs = tuple(data["dogs"])
+            self.vtree = data["tree"]
+            self.vbone = data["bone"]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid kiwis-and-dogs instance {path}: {e!r}") from e
+        self.num_kiwis = len(self.start_kiwis)
+        self.num_dogs = len(self.start_dogs)
+
+    def _compile(self):
+        """Build the vertex bits and per-vertex edge lists from `self.graph`."""
+        vertices = sorted(set(self.coordinates).union(*self.graph))
+        for v in (*self.start_kiwis, *self.start_dogs, self.vtree, self.vbone):
+            if v not in vertices:
+                raise ValueError(f"Unknown vertex: {v}")
+
+        # One bit per vertex; edge conditions are compiled into
+        # (required, forbidden) masks once instead of parsed on every call
+        self.vertices = vertices
+        self.vertex_index = {v: i for i, v in enumerate(vertices)}
+        self.vertex_bits = {v: 1 << i for i, v in enumerate(vertices)}
+        self._compiled_conditions = {}
+
+        # edge name -> (u, v, cost, required, forbidden)
+        self.edges = {}
+        # vertex -> [(edge name, other end, cost, required, forbidden), ...]
+        self.outgoing = {v: [] for v in vertices}
+        self.incoming = {v: [] for v in vertices}
+        for (u, v), (cost, conditions) in self.graph.items():
+            required, forbidden = self._compile_conditions(conditions)
+            name = f"{u}_to_{v}"
+            self.edges[name] = (u, v, cost, required, forbidden)
+            self.outgoing[u].append((name, v, cost, required, forbidden))
+            self.incoming[v].append((name, u, cost, required, forbidden))
+        self.edge_names = list(self.edges)
+
+        # The same edge lists by vertex index, for packed states
+        index = self.vertex_index
+        self._outgoing_index = [
+            [(name, index[v], cost, req, forb) for name, v, cost, req, forb in self.outgoing[u]]
+            for u in vertices
+        ]
+        self._incoming_index = [
+            [(name, index[u], cost, req, forb) for name, u, cost, req, forb in self.incoming[v]]
+            for v in vertices
+        ]
+
+        self._distances = None
+
+        self.start_state = State(kiwis=self.start_kiwis, dogs=self.start_dogs)
+        self.goal_state = State(
+            kiwis=(self.vtree,) * self.num_kiwis, dogs=(self.vbone,) * self.num_dogs
+        )
+        if self.packed:
+            self.start_state = self.pack(self.start_state)
+            self.goal_state = self.pack(self.goal_state)
+
+    def all_pairs_distances(self):
+        """Cheapest cost between every pair of vertex indices, ignoring the
+        edge conditions (Floyd-Warshall, computed once). inf = unreachable."""
+        if self._distances is None:
+            n = len(self.vertices)
+            dist = [[float("inf")] * n for _ in range(n)]
+            for i in range(n):
+                dist[i][i] = 0
+            index = self.vertex_index
+            for (u, v), (cost, _) in self.graph.items():
+                if cost < dist[index[u]][index[v]]:
+                    dist[index[u]][index[v]] = cost
+            for k in range(n):
+                dist_k = dist[k]
+                for i in range(n):
+                    dist_i = dist[i]
+                    d_ik = dist_i[k]
+                    if d_ik == float("inf"):
+                        continue
+                    for j in range(n):
+                        d = d_ik + dist_k[j]
+                        if d < dist_i[j]:
+                            dist_i[j] = d
+            self._distances = dist
+        return self._distances
+
+    # Packed states
+    ##########################################################################
+
+    def pack(self, state):
+        """Canonical integer of a `State`.
+
+        The digits, in base ``len(self.vertices)`` and most significant
+        first, are the sorted vertex indices of the kiwis followed by the
+        sorted ones of the dogs. Codes then compare like the canonical
+        ``(kiwis, dogs)`` tuples, so `GraphAStar`, which breaks f ties by
+        state, picks the same kind of successor as with `State` objects.
+        """
+        index = self.vertex_index
+        digits = sorted(index[v] for v in state.kiwis)
+        digits += sorted(index[v] for v in state.dogs)
+        return self._encode(digits)
+
+    def unpack(self, code):
+        """`State` of a packed state (agents in canonical order)."""
+        names = self.vertices
+        digits = self._decode(code)
+        return State(
+            kiwis=tuple(names[d] for d in digits[:self.num_kiwis]),
+            dogs=tuple(names[d] for d in digits[self.num_kiwis:]),
+        )
+
+    def _encode(self, digits):
+        base = len(self.vertices)
+        code = 0
+        for digit in digits:
+            code = code * base + digit
+        return code
+
+    def _decode(self, code):
+        base = len(self.vertices)
+        digits = []
+        for _ in range(self.num_kiwis + self.num_dogs):
+            code, digit = divmod(code, base)
+            digits.append(digit)
+        digits.reverse()
+        return digits
+
+    def _moved(self, digits, i, target):
+        """Packed state with agent `i` of `digits` moved to vertex `target`."""
+        digits = digits[:]
+        digits[i] = target
+        if i < self.num_kiwis:
+            digits[:self.num_kiwis] = sorted(digits[:self.num_kiwis])
+        else:
+            digits[self.num_kiwis:] = sorted(digits[self.num_kiwis:])
+        return self._encode(digits)
+
+    @staticmethod
+    def _digits_mask(digits):
+        mask = 0
+        for digit in digits:
+            mask |= 1 << digit
+        return mask
+
+    def _packed_moves(self, code, edges_by_vertex, forward):
+        """Moves of a packed state along outgoing (forward) or incoming edges.
+
+        Agents of the same kind on the same vertex are interchangeable, so
+        only the first of them is moved. Backward moves are labelled with the
+        forward action, i.e. with the mover's index in the predecessor.
+        """
+        digits = self._decode(code)
+        mask = self._digits_mask(digits)
+        result = []
+        for i, pos in enumerate(digits):
+            if i != 0 and i != self.num_kiwis and digits[i - 1] == pos:
+                continue
+            kind, first = ("kiwi", 0) if i < self.num_kiwis else ("dog", self.num_kiwis)
+            idx = i - first
+            for name, other, cost, required, forbidden in edges_by_vertex[pos]:
+                new_code = self._moved(digits, i, other)
+                if not forward:
+                    # Conditions hold in the state the move starts from, and
+                    # the mover sits at `other` there, maybe at another index
+                    previous = self._decode(new_code)
+                    mask = self._digits_mask(previous)
+                    idx = previous.index(other, first) - first
+                if mask & required == required and not mask & forbidden:
+                    result.append((f"move_{kind}({name}, {idx})", new_code, cost))
+        return result
 
     def get_coord(self, v):
         """Return the (x, y) coordinates of vertex v"""
         return self.coordinates.get(v, (0, 0))
 
     def get_start_states(self):
-        return [State(kiwis=("D", "F"), dogs=("C",))]
+        return [self.start_state]
 
     def is_goal_state(self, state):
         """Check if all kiwis are at vtree and all dogs are at vbone"""
+        if self.packed:
+            return state == self.goal_state
+
         all_kiwis_at_tree = all(kiwi == self.vtree for kiwi in state.kiwis)
         all_dogs_at_bone = all(dog == self.vbone for dog in state.dogs)
         return all_kiwis_at_tree and all_dogs_at_bone
@@ -79,482 +318,183 @@ class KiwisAndDogsProblem(Problem):
     def is_valid_state(self, _):
         return True
 
-    def _check_conditions(self, state, conditions):
-        """Check if the conditions for using an edge are satisfied"""
-        if not conditions:
-            return True
-        
+    def goal_states(self):
+        """The single goal state: every kiwi at vtree and every dog at vbone."""
+        return [self.goal_state]
+
+    def _compile_conditions(self, conditions):
+        """Turn "somebody(X),nobody(Y)" into (required, forbidden) vertex masks."""
+        compiled = self._compiled_conditions.get(conditions)
+        if compiled is not None:
+            return compiled
+
+        required = forbidden = 0
         condition_list = [c.strip() for c in conditions.split(",") if c.strip()]
-        
         for condition in condition_list:
-            if condition.startswith("somebody("):
-                vertex = condition[9:-1]
-                has_someone = (vertex in state.kiwis) or (vertex in state.dogs)
-                if not has_someone:
-                    return False
-                    
-            elif condition.startswith("nobody("):
-                vertex = condition[7:-1]
-                has_someone = (vertex in state.kiwis) or (vertex in state.dogs)
-                if has_someone:
-                    return False
-        
-        return True
-
-    # KIWI ACTIONS - A
-    @action(DDRange(0, "num_kiwis"), cost=3)
-    def move_kiwi_A_to_B(self, state, kiwi_idx):
-        """Move a kiwi from A to B (cost 3, nobody(E))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "A":
-            return None
-        
-        if not self._check_conditions(state, "nobody(E)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "B"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=4)
-    def move_kiwi_A_to_C(self, state, kiwi_idx):
-        """Move a kiwi from A to C (cost 4)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "A":
+            name, _, vertex = condition.rstrip(")").partition("(")
+            bit = self.vertex_bits.get(vertex)
+            if bit is None or name not in ("somebody", "nobody"):
+                raise ValueError(f"Invalid edge condition: {condition}")
+            if name == "somebody":
+                required |= bit
+            else:
+                forbidden |= bit
+
+        compiled = self._compiled_conditions[conditions] = (required, forbidden)
+        return compiled
+
+    def _occupancy(self, state):
+        """Bitmask of the vertices with at least one kiwi or dog, cached on the state."""
+        mask = state.occupancy
+        if mask is None:
+            mask = 0
+            bits = self.vertex_bits
+            for vertex in state.kiwis:
+                mask |= bits[vertex]
+            for vertex in state.dogs:
+                mask |= bits[vertex]
+            object.__setattr__(state, "occupancy", mask)
+        return mask
+
+    # Actions
+    ##########################################################################
+
+    @action(DCategorical("edge_names"), DDRange(0, "num_kiwis"))
+    def move_kiwi(self, state, edge, kiwi_idx):
+        """Move kiwi `kiwi_idx` along `edge`, paying the edge cost."""
+        if self.packed:
+            return self._packed_move(state, edge, kiwi_idx)
+
+        u, v, cost, required, forbidden = self.edges[edge]
+        if state.kiwis[kiwi_idx] != u:
+            return None
+
+        mask = self._occupancy(state)
+        if mask & required != required or mask & forbidden:
             return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "C"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - B
-    @action(DDRange(0, "num_kiwis"), cost=3)
-    def move_kiwi_B_to_A(self, state, kiwi_idx):
-        """Move a kiwi from B to A (cost 3, nobody(E))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "B":
-            return None
-        
-        if not self._check_conditions(state, "nobody(E)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "A"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=1)
-    def move_kiwi_B_to_C(self, state, kiwi_idx):
-        """Move a kiwi from B to C (cost 1)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "B":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "C"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=5)
-    def move_kiwi_B_to_G(self, state, kiwi_idx):
-        """Move a kiwi from B to G (cost 5)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "B":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "G"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - C
-    @action(DDRange(0, "num_kiwis"), cost=1)
-    def move_kiwi_C_to_B(self, state, kiwi_idx):
-        """Move a kiwi from C to B (cost 1)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "C":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "B"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=2)
-    def move_kiwi_C_to_D(self, state, kiwi_idx):
-        """Move a kiwi from C to D (cost 2, somebody(E),somebody(G))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "C":
-            return None
-        
-        if not self._check_conditions(state, "somebody(E),somebody(G)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "D"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=4)
-    def move_kiwi_C_to_A(self, state, kiwi_idx):
-        """Move a kiwi from C to A (cost 4)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "C":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "A"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - D
-    @action(DDRange(0, "num_kiwis"), cost=2)
-    def move_kiwi_D_to_C(self, state, kiwi_idx):
-        """Move a kiwi from D to C (cost 2, somebody(E),somebody(G))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(E),somebody(G)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "C"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=8)
-    def move_kiwi_D_to_E(self, state, kiwi_idx):
-        """Move a kiwi from D to E (cost 8, somebody(A))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(A)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "E"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=3)
-    def move_kiwi_D_to_F(self, state, kiwi_idx):
-        """Move a kiwi from D to F (cost 3, somebody(C))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(C)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "F"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - E
-    @action(DDRange(0, "num_kiwis"), cost=8)
-    def move_kiwi_E_to_D(self, state, kiwi_idx):
-        """Move a kiwi from E to D (cost 8, somebody(A))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "E":
-            return None
-        
-        if not self._check_conditions(state, "somebody(A)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "D"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=5)
-    def move_kiwi_E_to_F(self, state, kiwi_idx):
-        """Move a kiwi from E to F (cost 5)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "E":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "F"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - F
-    @action(DDRange(0, "num_kiwis"), cost=3)
-    def move_kiwi_F_to_D(self, state, kiwi_idx):
-        """Move a kiwi from F to D (cost 3, somebody(C))"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "F":
-            return None
-        
-        if not self._check_conditions(state, "somebody(C)"):
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "D"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=5)
-    def move_kiwi_F_to_E(self, state, kiwi_idx):
-        """Move a kiwi from F to E (cost 5)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "F":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "E"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=7)
-    def move_kiwi_F_to_G(self, state, kiwi_idx):
-        """Move a kiwi from F to G (cost 7)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "F":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "G"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # KIWI ACTIONS - G
-    @action(DDRange(0, "num_kiwis"), cost=7)
-    def move_kiwi_G_to_F(self, state, kiwi_idx):
-        """Move a kiwi from G to F (cost 7)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "G":
-            return None
-        
-        new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "F"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    @action(DDRange(0, "num_kiwis"), cost=5)
-    def move_kiwi_G_to_B(self, state, kiwi_idx):
-        """Move a kiwi from G to B (cost 5)"""
-        current_pos = state.kiwis[kiwi_idx]
-        if current_pos != "G":
-            return None
-        
+
         new_kiwis = list(state.kiwis)
-        new_kiwis[kiwi_idx] = "B"
-        return State(kiwis=tuple(new_kiwis), dogs=state.dogs)
-
-    # DOG ACTIONS - A
-    @action(DDRange(0, "num_dogs"), cost=3)
-    def move_dog_A_to_B(self, state, dog_idx):
-        """Move a dog from A to B (cost 3, nobody(E))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "A":
-            return None
-        
-        if not self._check_conditions(state, "nobody(E)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "B"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=4)
-    def move_dog_A_to_C(self, state, dog_idx):
-        """Move a dog from A to C (cost 4)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "A":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "C"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - B
-    @action(DDRange(0, "num_dogs"), cost=3)
-    def move_dog_B_to_A(self, state, dog_idx):
-        """Move a dog from B to A (cost 3, nobody(E))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "B":
-            return None
-        
-        if not self._check_conditions(state, "nobody(E)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "A"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=1)
-    def move_dog_B_to_C(self, state, dog_idx):
-        """Move a dog from B to C (cost 1)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "B":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "C"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=5)
-    def move_dog_B_to_G(self, state, dog_idx):
-        """Move a dog from B to G (cost 5)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "B":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "G"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - C
-    @action(DDRange(0, "num_dogs"), cost=1)
-    def move_dog_C_to_B(self, state, dog_idx):
-        """Move a dog from C to B (cost 1)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "C":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "B"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=2)
-    def move_dog_C_to_D(self, state, dog_idx):
-        """Move a dog from C to D (cost 2, somebody(E),somebody(G))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "C":
-            return None
-        
-        if not self._check_conditions(state, "somebody(E),somebody(G)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "D"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=4)
-    def move_dog_C_to_A(self, state, dog_idx):
-        """Move a dog from C to A (cost 4)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "C":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "A"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - D
-    @action(DDRange(0, "num_dogs"), cost=2)
-    def move_dog_D_to_C(self, state, dog_idx):
-        """Move a dog from D to C (cost 2, somebody(E),somebody(G))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(E),somebody(G)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "C"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=8)
-    def move_dog_D_to_E(self, state, dog_idx):
-        """Move a dog from D to E (cost 8, somebody(A))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(A)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "E"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=3)
-    def move_dog_D_to_F(self, state, dog_idx):
-        """Move a dog from D to F (cost 3, somebody(C))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "D":
-            return None
-        
-        if not self._check_conditions(state, "somebody(C)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "F"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - E
-    @action(DDRange(0, "num_dogs"), cost=8)
-    def move_dog_E_to_D(self, state, dog_idx):
-        """Move a dog from E to D (cost 8, somebody(A))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "E":
-            return None
-        
-        if not self._check_conditions(state, "somebody(A)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "D"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=5)
-    def move_dog_E_to_F(self, state, dog_idx):
-        """Move a dog from E to F (cost 5)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "E":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "F"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - F
-    @action(DDRange(0, "num_dogs"), cost=3)
-    def move_dog_F_to_D(self, state, dog_idx):
-        """Move a dog from F to D (cost 3, somebody(C))"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "F":
-            return None
-        
-        if not self._check_conditions(state, "somebody(C)"):
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "D"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=5)
-    def move_dog_F_to_E(self, state, dog_idx):
-        """Move a dog from F to E (cost 5)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "F":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "E"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=7)
-    def move_dog_F_to_G(self, state, dog_idx):
-        """Move a dog from F to G (cost 7)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "F":
-            return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "G"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    # DOG ACTIONS - G
-    @action(DDRange(0, "num_dogs"), cost=7)
-    def move_dog_G_to_F(self, state, dog_idx):
-        """Move a dog from G to F (cost 7)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "G":
+        new_kiwis[kiwi_idx] = v
+        return cost, State(kiwis=tuple(new_kiwis), dogs=state.dogs)
+
+    @action(DCategorical("edge_names"), DDRange(0, "num_dogs"))
+    def move_dog(self, state, edge, dog_idx):
+        """Move dog `dog_idx` along `edge`, paying the edge cost."""
+        if self.packed:
+            return self._packed_move(state, edge, self.num_kiwis + dog_idx)
+
+        u, v, cost, required, forbidden = self.edges[edge]
+        if state.dogs[dog_idx] != u:
             return None
-        
-        new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "F"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
-
-    @action(DDRange(0, "num_dogs"), cost=5)
-    def move_dog_G_to_B(self, state, dog_idx):
-        """Move a dog from G to B (cost 5)"""
-        current_pos = state.dogs[dog_idx]
-        if current_pos != "G":
+
+        mask = self._occupancy(state)
+        if mask & required != required or mask & forbidden:
             return None
-        
+
         new_dogs = list(state.dogs)
-        new_dogs[dog_idx] = "B"
-        return State(kiwis=state.kiwis, dogs=tuple(new_dogs))
\ No newline at end of file
+        new_dogs[dog_idx] = v
+        return cost, State(kiwis=state.kiwis, dogs=tuple(new_dogs))
+
+    def _packed_move(self, code, edge, i):
+        u, v, cost, required, forbidden = self.edges[edge]
+        digits = self._decode(code)
+        if self.vertices[digits[i]] != u:
+            return None
+
+        mask = self._digits_mask(digits)
+        if mask & required != required or mask & forbidden:
+            return None
+        return cost, self._moved(digits, i, self.vertex_index[v])
+
+    def successors(self, state):
+        """Legal ``(action, new_state, cost)`` moves from `state`.
+
+        Fast path for the algorithms in `algorithms/`: only the outgoing
+        edges of each agent's vertex are tried, instead of every
+        (edge, agent) pair of the generic actions.
+        """
+        if self.packed:
+            return self._packed_moves(state, self._outgoing_index, True)
+
+        mask = self._occupancy(state)
+        kiwis, dogs = state.kiwis, state.dogs
+        result = []
+        for idx, pos in enumerate(kiwis):
+            for name, v, cost, required, forbidden in self.outgoing[pos]:
+                if mask & required == required and not mask & forbidden:
+                    new_kiwis = kiwis[:idx] + (v,) + kiwis[idx + 1:]
+                    result.append((f"move_kiwi({name}, {idx})", State(kiwis=new_kiwis, dogs=dogs), cost))
+        for idx, pos in enumerate(dogs):
+            for name, v, cost, required, forbidden in self.outgoing[pos]:
+                if mask & required == required and not mask & forbidden:
+                    new_dogs = dogs[:idx] + (v,) + dogs[idx + 1:]
+                    result.append((f"move_dog({name}, {idx})", State(kiwis=kiwis, dogs=new_dogs), cost))
+        return result
+
+    def predecessors(self, state):
+        """``(action, previous_state, cost)`` moves that lead into `state`.
+
+        For every edge (u, v) each kiwi or dog standing on v may have come
+        from u, as long as the edge conditions held in the previous state.
+        """
+        if self.packed:
+            return self._packed_moves(state, self._incoming_index, False)
+
+        kiwis, dogs = state.kiwis, state.dogs
+        result = []
+        for idx, pos in enumerate(kiwis):
+            for name, u, cost, required, forbidden in self.incoming[pos]:
+                previous = State(kiwis=kiwis[:idx] + (u,) + kiwis[idx + 1:], dogs=dogs)
+                mask = self._occupancy(previous)
+                if mask & required == required and not mask & forbidden:
+                    result.append((f"move_kiwi({name}, {idx})", previous, cost))
+        for idx, pos in enumerate(dogs):
+            for name, u, cost, required, forbidden in self.incoming[pos]:
+                previous = State(kiwis=kiwis, dogs=dogs[:idx] + (u,) + dogs[idx + 1:])
+                mask = self._occupancy(previous)
+                if mask & required == required and not mask & forbidden:
+                    result.append((f"move_dog({name}, {idx})", previous, cost))
+        return result
+
+
+# Heuristics
+##############################################################################
+
+
+@KiwisAndDogsProblem.heuristic
+class ShortestPathHeuristic(Heuristic):
+    """
+    Sum over the agents of the cheapest cost from their vertex to their
+    target (vtree for kiwis, vbone for dogs).
+
+    The costs come from an all-pairs shortest path table over the graph
+    with the edge conditions dropped. Relaxing conditions only adds moves,
+    and every move carries a single agent, so the sum never overestimates:
+    it is admissible (and consistent). Each evaluation is O(agents).
+    """
+
+    NAME = "ShortestPath"
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        dist = problem.all_pairs_distances()
+        tree = problem.vertex_index[problem.vtree]
+        bone = problem.vertex_index[problem.vbone]
+        self.packed = problem.packed
+        self.num_kiwis = problem.num_kiwis
+        self.vertex_index = problem.vertex_index
+        self.decode = problem._decode
+        self.to_tree = [row[tree] for row in dist]
+        self.to_bone = [row[bone] for row in dist]
+
+    def compute(self, state):
+        if self.packed:
+            digits = self.decode(state)
+            kiwis, dogs = digits[:self.num_kiwis], digits[self.num_kiwis:]
+        else:
+            index = self.vertex_index
+            kiwis = [index[v] for v in state.kiwis]
+            dogs = [index[v] for v in state.dogs]
+
+        to_tree, to_bone = self.to_tree, self.to_bone
+        return sum(to_tree[k] for k in kiwis) + sum(to_bone[d] for d in dogs)
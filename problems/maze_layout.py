@@ -0,0 +1,305 @@
+import bisect
+import hashlib
+import os
+import struct
+import zlib
+
+from array import array
+from collections import deque
+
+# Loader for Pacman ``.lay`` files
+##############################################################################
+
+# Directions in the order of the Pacman `move` action: (name, dr, dc)
+DIRECTIONS = (("U", -1, 0), ("D", 1, 0), ("L", 0, -1), ("R", 0, 1))
+
+CACHE_ENV = "PACMAN_LAYOUT_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pacman-layouts")
+
+_MAGIC = b"PLAY"
+_VERSION = 2
+# magic, version, mtime_ns, size, rows, cols, start r/c, food r/c,
+# len(path), len(walls)
+_HEADER = struct.Struct("<4sHqqiiiiiiII")
+
+_TO_WALL = bytes(1 if ch == ord("%") else 0 for ch in range(256))
+
+
+class MazeLayout:
+    """Parsed maze: size, flat wall bitmap, start and food.
+
+    Cells are numbered ``r * cols + c``. `walls` is a bytearray (1 = wall).
+    `start` and `food` are ``(r, c)`` or None. `move_table[4 * cell + d]`
+    is the cell reached with direction `d` of `DIRECTIONS`, or -1; it is a
+    loop over every cell, so it is only built when first accessed (BFS
+    distances, landmarks). The text rows are only read if `grid` is
+    accessed (the visualizer).
+    """
+
+    def __init__(self, path, rows, cols, walls, start, food):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.walls = walls
+        self.start = start
+        self.food = food
+        self._grid = None
+        self._move_table = None
+
+    @property
+    def move_table(self):
+        if self._move_table is None:
+            self._move_table = build_move_table(self.walls, self.rows, self.cols)
+        return self._move_table
+
+    @property
+    def grid(self):
+        """Rows of the layout as strings, as in ``[line.strip() for line in fh]``."""
+        if self._grid is None:
+            with open(self.path) as fh:
+                self._grid = [line.strip() for line in fh]
+        return self._grid
+
+
+def load_layout(path, cache_dir=None):
+    """Load a ``.lay`` file, using the binary sidecar cache when possible.
+
+    The sidecar lives in `cache_dir` (default: ``$PACMAN_LAYOUT_CACHE`` or
+    ``~/.cache/pacman-layouts``). It holds the wall bitmap, start and food,
+    and is keyed by absolute path, mtime and size, so an edited layout is
+    parsed again. Pass ``cache_dir=False``, or set the variable to an empty
+    string, to skip the cache.
+    """
+    path = os.path.abspath(path)
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_ENV, DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return parse_layout(path)
+
+    st = os.stat(path)
+    digest = hashlib.sha1(path.encode("utf-8", "surrogateescape")).hexdigest()
+    sidecar = os.path.join(cache_dir, digest + ".bin")
+    layout = _read_sidecar(sidecar, path, st)
+    if layout is not None:
+        return layout
+
+    layout = parse_layout(path)
+    try:
+        _write_sidecar(sidecar, layout, st)
+    except OSError:
+        pass  # read-only cache dir: the cache is only an optimisation
+    return layout
+
+
+def parse_layout(path):
+    """Parse a ``.lay`` file with bulk bytes operations."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if not data:
+        raise ValueError(f"Empty layout file: {path}")
+    lines = data.split(b"\n")
+    # Like iterating a text file: no extra row after the final newline
+    if lines and not lines[-1]:
+        lines.pop()
+    # Offset of the first byte of every row
+    line_starts = [0]
+    for line in lines[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    start = _find_last(data, lines, line_starts, b"P")
+    food = _find_last(data, lines, line_starts, b".")
+
+    rows = len(lines)
+    cols = len(lines[0].strip())
+    walls = bytearray()
+    for line in lines:
+        line = line.strip()[:cols].translate(_TO_WALL)
+        walls += line
+        walls += b"\x01" * (cols - len(line))
+
+    return MazeLayout(path, rows, cols, walls, start, food)
+
+
+def _find_last(data, lines, line_starts, token):
+    """(r, c) of the last `token` in the stripped rows, or None."""
+    offset = data.rfind(token)
+    if offset < 0:
+        return None
+    row = bisect.bisect_right(line_starts, offset) - 1
+    line = lines[row]
+    # Columns are counted after stripping the leading whitespace
+    indent = len(line) - len(line.lstrip())
+    return (row, offset - line_starts[row] - indent)
+
+
+def cell_moves(walls, rows, cols, cell):
+    """``(d, target_cell)`` of the open neighbours of `cell`, in `DIRECTIONS` order."""
+    r, c = divmod(cell, cols)
+    moves = []
+    if r > 0 and not walls[cell - cols]:
+        moves.append((0, cell - cols))
+    if r < rows - 1 and not walls[cell + cols]:
+        moves.append((1, cell + cols))
+    if c > 0 and not walls[cell - 1]:
+        moves.append((2, cell - 1))
+    if c < cols - 1 and not walls[cell + 1]:
+        moves.append((3, cell + 1))
+    return moves
+
+
+def build_move_table(walls, rows, cols):
+    """Target cell for every (cell, direction), -1 if it is blocked."""
+    move_table = array("l", [-1]) * (4 * rows * cols)
+    cell = walls.find(0)
+    while cell >= 0:
+        for d, target in cell_moves(walls, rows, cols, cell):
+            move_table[4 * cell + d] = target
+        cell = walls.find(0, cell + 1)
+    return move_table
+
+
+def bfs_distances(move_table, source):
+    """Unit-cost distances from cell `source` to every cell (-1 = unreachable).
+
+    Moves are symmetric, so this is also the distance *to* `source`.
+    """
+    distances = array("l", [-1]) * (len(move_table) // 4)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        cell = queue.popleft()
+        next_distance = distances[cell] + 1
+        for target in move_table[4 * cell:4 * cell + 4]:
+            if target >= 0 and distances[target] < 0:
+                distances[target] = next_distance
+                queue.append(target)
+    return distances
+
+
+def select_landmarks(move_table, seed_cell, count):
+    """Pick `count` landmarks by farthest-point selection.
+
+    The first landmark is the cell farthest from `seed_cell`; each next one
+    is the reachable cell whose distance to the closest landmark chosen so
+    far is largest. Returns ``(landmarks, tables)`` where ``tables[i]`` are
+    the BFS distances from ``landmarks[i]``.
+    """
+    seed = bfs_distances(move_table, seed_cell)
+    # Cells in another component than the seed keep -1 and are never chosen
+    closest = array("l", seed)
+    landmarks, tables = [], []
+    for _ in range(count):
+        best = max(range(len(closest)), key=closest.__getitem__)
+        if closest[best] <= 0:
+            break  # every reachable cell is already a landmark
+        distances = bfs_distances(move_table, best)
+        landmarks.append(best)
+        tables.append(distances)
+        for cell, d in enumerate(distances):
+            if 0 <= d < closest[cell]:
+                closest[cell] = d
+    return landmarks, tables
+
+
+_LANDMARK_MAGIC = b"PALT"
+_LANDMARK_VERSION = 2
+# magic, version, rows, cols, crc32(walls), requested landmarks,
+# number of landmarks, len(blob)
+_LANDMARK_HEADER = struct.Struct("<4sHiiIiiI")
+
+
+def save_landmarks(path, layout, landmarks, tables, requested):
+    """Store ALT landmarks and their distance tables in a binary file.
+
+    `requested` is the count asked of `select_landmarks`, which may have
+    stopped earlier on layouts with few reachable cells.
+    """
+    blob = array("l", landmarks).tobytes() + b"".join(t.tobytes() for t in tables)
+    blob = zlib.compress(blob, 6)
+    header = _LANDMARK_HEADER.pack(
+        _LANDMARK_MAGIC, _LANDMARK_VERSION, layout.rows, layout.cols,
+        zlib.crc32(layout.walls), requested, len(landmarks), len(blob),
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(header + blob)
+    os.replace(tmp, path)
+
+
+def load_landmarks(path, layout, requested):
+    """Load tables written by `save_landmarks`, or None if they do not match
+    `layout` or were selected for another `requested` count."""
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    if len(data) < _LANDMARK_HEADER.size:
+        return None
+
+    (magic, version, rows, cols, crc, saved_requested, count,
+     blob_len) = _LANDMARK_HEADER.unpack_from(data)
+    if (magic != _LANDMARK_MAGIC or version != _LANDMARK_VERSION or rows != layout.rows
+            or cols != layout.cols or crc != zlib.crc32(layout.walls)
+            or saved_requested != requested):
+        return None
+
+    values = array("l")
+    try:
+        offset = _LANDMARK_HEADER.size
+        values.frombytes(zlib.decompress(data[offset:offset + blob_len]))
+    except (zlib.error, ValueError):
+        return None
+    cells = rows * cols
+    if len(values) != count * (cells + 1):
+        return None
+    landmarks = list(values[:count])
+    tables = [values[count + i * cells:count + (i + 1) * cells] for i in range(count)]
+    return landmarks, tables
+
+
+def _read_sidecar(sidecar, path, st):
+    try:
+        with open(sidecar, "rb") as fh:
+            blob = fh.read()
+    except OSError:
+        return None
+    if len(blob) < _HEADER.size:
+        return None
+
+    (magic, version, mtime_ns, size, rows, cols, start_r, start_c,
+     food_r, food_c, path_len, walls_len) = _HEADER.unpack_from(blob)
+    if (magic != _MAGIC or version != _VERSION
+            or mtime_ns != st.st_mtime_ns or size != st.st_size):
+        return None
+
+    offset = _HEADER.size
+    if blob[offset:offset + path_len] != path.encode("utf-8", "surrogateescape"):
+        return None
+    offset += path_len
+
+    walls = bytearray(blob[offset:offset + walls_len])
+    if walls_len != rows * cols or len(walls) != walls_len:
+        return None
+
+    start = (start_r, start_c) if start_r >= 0 else None
+    food = (food_r, food_c) if food_r >= 0 else None
+    return MazeLayout(path, rows, cols, walls, start, food)
+
+
+def _write_sidecar(sidecar, layout, st):
+    os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+    path_bytes = layout.path.encode("utf-8", "surrogateescape")
+    start_r, start_c = layout.start or (-1, -1)
+    food_r, food_c = layout.food or (-1, -1)
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, st.st_mtime_ns, st.st_size, layout.rows, layout.cols,
+        start_r, start_c, food_r, food_c,
+        len(path_bytes), len(layout.walls),
+    )
+
+    # Write to a temporary file first so readers never see a partial sidecar
+    tmp = f"{sidecar}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(header + path_bytes + layout.walls)
+    os.replace(tmp, sidecar)
@@ -1,3 +1,4 @@
+import os
 import pygame
 import random
 
@@ -102,6 +103,143 @@ class NQueensVisualizer(SolutionVisualizer):
         pygame.display.flip()
 
 
+# Board
+##############################################################################
+
+
+class Board:
+    """Queen rows indexed by column, with incremental conflict counters.
+
+    A `Board` behaves like the tuple of its rows (indexing, slicing, len,
+    iteration) and hashes and compares exactly like it, so graph search
+    sees the same states as before. It is not a `tuple` subclass because
+    those cannot have ``__slots__``, and boards fill closed sets.
+
+    On top of that it knows its number of attacking pairs (`conflicts`). A
+    board made by `moved()` gets that number in O(1) from the parent's row,
+    diagonal and anti-diagonal counters; its own counters are only derived
+    (O(n), from the parent's) when one of its children needs them, and the
+    reference to the parent is dropped then. `origin` records the move that
+    produced it, which `RepairHeuristic` also uses.
+    """
+
+    __slots__ = ("_rows", "_hash", "_conflicts", "_counters", "_origin")
+
+    def __init__(self, rows=()):
+        self._rows = rows = tuple(rows)
+        self._hash = hash(rows)
+        self._conflicts = None
+        self._counters = None
+        # (parent, col, old_row, new_row) for boards made by a move; the
+        # parent becomes None once this board's counters are derived
+        self._origin = None
+
+    def __reduce__(self):
+        # Pickle as a bare board, without the parent chain
+        return (Board, (self._rows,))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self._rows == (other._rows if type(other) is Board else other)
+
+    def __ne__(self, other):
+        return self._rows != (other._rows if type(other) is Board else other)
+
+    def __lt__(self, other):
+        return self._rows < (other._rows if type(other) is Board else other)
+
+    def __le__(self, other):
+        return self._rows <= (other._rows if type(other) is Board else other)
+
+    def __gt__(self, other):
+        return self._rows > (other._rows if type(other) is Board else other)
+
+    def __ge__(self, other):
+        return self._rows >= (other._rows if type(other) is Board else other)
+
+    def __repr__(self):
+        return repr(self._rows)
+
+    @property
+    def origin(self):
+        """``(parent, col, old_row, new_row)`` of the move that made this
+        board, or None for a board built from scratch. `parent` is None
+        once the board's own counters have been derived."""
+        return self._origin
+
+    @property
+    def conflicts(self):
+        """Number of pairs of queens that attack each other."""
+        if self._conflicts is None:
+            self._conflicts = sum(
+                k * (k - 1) // 2 for counter in self.counters() for k in counter
+            )
+        return self._conflicts
+
+    def counters(self):
+        """Queens per row, per diagonal (row + col) and per anti-diagonal
+        (row - col + n - 1), as three lists."""
+        if self._counters is None:
+            n = len(self)
+            parent = self._origin[0] if self._origin is not None else None
+            if parent is not None:
+                _, col, old_row, new_row = self._origin
+                rows, diagonals, anti_diagonals = (list(c) for c in parent.counters())
+                rows[old_row] -= 1
+                diagonals[old_row + col] -= 1
+                anti_diagonals[old_row - col + n - 1] -= 1
+                rows[new_row] += 1
+                diagonals[new_row + col] += 1
+                anti_diagonals[new_row - col + n - 1] += 1
+            else:
+                rows = [0] * n
+                diagonals = [0] * (2 * n - 1)
+                anti_diagonals = [0] * (2 * n - 1)
+                for col, row in enumerate(self._rows):
+                    rows[row] += 1
+                    diagonals[row + col] += 1
+                    anti_diagonals[row - col + n - 1] += 1
+            self._counters = (rows, diagonals, anti_diagonals)
+            if parent is not None:
+                # Keep the move only, so closed sets do not hold ancestor chains
+                self._origin = (None,) + self._origin[1:]
+        return self._counters
+
+    def moved(self, col, new_row):
+        """Board with the queen of column `col` moved to `new_row`."""
+        n = len(self)
+        old_row = self[col]
+        rows, diagonals, anti_diagonals = self.counters()
+
+        rows_tuple = self._rows
+        child = Board(rows_tuple[:col] + (new_row,) + rows_tuple[col + 1:])
+        # The old and new square share no line (same column, other row), so
+        # the queen's attacks on the old lines are lost and the ones on the
+        # new lines are the counts there.
+        child._conflicts = (
+            self.conflicts
+            - (rows[old_row] - 1)
+            - (diagonals[old_row + col] - 1)
+            - (anti_diagonals[old_row - col + n - 1] - 1)
+            + rows[new_row]
+            + diagonals[new_row + col]
+            + anti_diagonals[new_row - col + n - 1]
+        )
+        child._origin = (self, col, old_row, new_row)
+        return child
+
+
 # Problem
 ##############################################################################
 
@@ -133,16 +271,19 @@ class NQueensIterativeRepair(Problem):
 
     def get_start_states(self):
         """Generate random initial configuration with N queens on the board."""
-        return [tuple(random.randint(0, self.b_size - 1) for _ in range(self.b_size))]
+        return [Board(random.randint(0, self.b_size - 1) for _ in range(self.b_size))]
 
     def is_goal_state(self, state):
         """A state is a goal if no queens attack each other."""
-        if not isinstance(state, (tuple, list)):
+        if not isinstance(state, (Board, tuple, list)):
             return False
             
         if len(state) != self.b_size:
             return False
-        
+
+        if isinstance(state, Board):
+            return state.conflicts == 0
+
         n = len(state)
         
         for col1 in range(n):
@@ -163,7 +304,7 @@ class NQueensIterativeRepair(Problem):
     
     def is_valid_state(self, state):
         """A state is valid if all queens are within the board boundaries."""
-        if not isinstance(state, (tuple, list)):
+        if not isinstance(state, (Board, tuple, list)):
             return False
             
         if len(state) != self.b_size:
@@ -184,29 +325,130 @@ class NQueensIterativeRepair(Problem):
         # Can't move to the same position
         if old_row == new_row:
             return None
-        
-        new_state = list(state)
-        new_state[queen_col] = new_row
-        new_state = tuple(new_state)
 
-        return new_state
+        if not isinstance(state, Board):
+            state = Board(state)
+        return state.moved(queen_col, new_row)
+
+    def successors(self, state):
+        """All ``(action, new_state, cost)`` moves from `state`.
+
+        Fast path for the algorithms in `algorithms/`: a single loop over a
+        shared row buffer builds the n·(n-1) children, instead of n² calls
+        to `move_queen` of which n return None. Children come out in
+        ``(queen_col, new_row)`` order and carry their conflict count, as
+        with `Board.moved`.
+        """
+        if not isinstance(state, Board):
+            state = Board(state)
+        n = len(state)
+        names = self._action_names(n)
+        rows, diagonals, anti_diagonals = state.counters()
+        conflicts = state.conflicts
+
+        buffer = list(state)
+        result = []
+        for col in range(n):
+            old_row = buffer[col]
+            col_names = names[col]
+            # Conflicts of the board without this queen
+            base = (
+                conflicts
+                - (rows[old_row] - 1)
+                - (diagonals[old_row + col] - 1)
+                - (anti_diagonals[old_row - col + n - 1] - 1)
+            )
+            for new_row in range(n):
+                if new_row == old_row:
+                    continue
+                buffer[col] = new_row
+                child = Board(buffer)
+                child._conflicts = (
+                    base
+                    + rows[new_row]
+                    + diagonals[new_row + col]
+                    + anti_diagonals[new_row - col + n - 1]
+                )
+                child._origin = (state, col, old_row, new_row)
+                result.append((col_names[new_row], child, 1))
+            buffer[col] = old_row
+        return result
+
+    def _action_names(self, n):
+        """``move_queen(col, row)`` strings, built once per board size."""
+        names = getattr(self, "_names", None)
+        if names is None or len(names) != n:
+            names = self._names = [
+                [f"move_queen({col}, {row})" for row in range(n)] for col in range(n)
+            ]
+        return names
 
 
 # Heuristic
 ##############################################################################
 
+# Set to a non-empty value other than "0" to cross-check RepairHeuristic
+CROSS_CHECK_ENV = "NQUEENS_CROSS_CHECK"
+
+
+class HeuristicMismatch(RuntimeError):
+    """An incremental `RepairHeuristic` value differs from the full one."""
+
 
 @NQueensIterativeRepair.heuristic
 class RepairHeuristic(Heuristic):
     """
     Heuristic: Minimal number of moves to achieve unique rows.
+
+    h = n - #{r : sorted(state)[r] == r}. With cnt[r] queens in row r and
+    E(r) = cnt[0] + ... + cnt[r-1] - r, row r is a fixed point of the
+    sorted state iff E(r) <= 0 <= E(r+1). Moving one queen from row a to
+    row b only shifts E by -1 (a < b) or +1 (a > b) between both rows, so
+    with prefix sums of "E(r) <= t <= E(r+1)" for t = -1, 0, 1 over the
+    parent a child's h takes O(1). The parent's tables are O(n) and are
+    kept for the last parent, i.e. for all the children of one expansion.
+
+    `compute(state)` uses the parent recorded in a `Board`'s origin; a
+    parent (and its h) can also be passed explicitly. With
+    `cross_check=True` every incremental value is compared with the full
+    computation and `HeuristicMismatch` is raised if they differ. It
+    defaults to ``$NQUEENS_CROSS_CHECK``, so the check can be turned on
+    when the heuristic is built by ``hlogedu-search``.
     """
 
-    def compute(self, state):
+    def __init__(self, problem, cross_check=None):
+        super().__init__(problem)
+        if cross_check is None:
+            cross_check = os.environ.get(CROSS_CHECK_ENV, "") not in ("", "0")
+        self.cross_check = cross_check
+        self._table_parent = None
+        self._tables = None
+
+    def compute(self, state, parent=None, parent_h=None):
         """Compute minimum moves needed to achieve unique rows."""
-        if not isinstance(state, (tuple, list)):
+        if not isinstance(state, (Board, tuple, list)):
             return float('inf')
-        
+
+        move = None
+        if parent is None:
+            origin = state.origin if isinstance(state, Board) else None
+            if origin is not None and origin[0] is not None:
+                parent, col, old_row, new_row = origin
+                move = (old_row, new_row)
+        if parent is not None and move is None:
+            move = self._find_move(parent, state)
+
+        if move is None:
+            return self._full(state)
+
+        h = self._incremental(parent, parent_h, *move)
+        if self.cross_check:
+            expected = self._full(state)
+            if h != expected:
+                raise HeuristicMismatch(f"incremental h={h}, full h={expected} for {state}")
+        return h
+
+    def _full(self, state):
         n = len(state)
         
         # Sort current rows
@@ -217,3 +459,71 @@ class RepairHeuristic(Heuristic):
         moves_needed = sum(1 for i in range(n) if sorted_rows[i] != i)
         
         return moves_needed
+
+    @staticmethod
+    def _find_move(parent, state):
+        """(old_row, new_row) if `state` is `parent` with one queen moved."""
+        if len(parent) != len(state):
+            return None
+        move = None
+        for old_row, new_row in zip(parent, state):
+            if old_row != new_row:
+                if move is not None:
+                    return None
+                move = (old_row, new_row)
+        return move
+
+    def _parent_tables(self, parent):
+        if self._table_parent is not parent:
+            n = len(parent)
+            if isinstance(parent, Board):
+                rows = parent.counters()[0]
+            else:
+                rows = [0] * n
+                for row in parent:
+                    rows[row] += 1
+
+            excess = [0] * (n + 1)
+            for r in range(n):
+                excess[r + 1] = excess[r] + rows[r] - 1
+            # prefix[t + 1][k] = #{r < k : excess[r] <= t <= excess[r + 1]}
+            prefix = ([0] * (n + 1), [0] * (n + 1), [0] * (n + 1))
+            for t, sums in zip((-1, 0, 1), prefix):
+                total = 0
+                for r in range(n):
+                    if excess[r] <= t <= excess[r + 1]:
+                        total += 1
+                    sums[r + 1] = total
+
+            self._table_parent = parent
+            self._tables = (excess, prefix)
+        return self._tables
+
+    def _incremental(self, parent, parent_h, a, b):
+        """h of `parent` with one queen moved from row `a` to row `b`."""
+        excess, (below, fixed, above) = self._parent_tables(parent)
+        n = len(parent)
+        if parent_h is None:
+            parent_h = n - fixed[n]
+        elif self.cross_check and parent_h != n - fixed[n]:
+            raise HeuristicMismatch(f"parent_h={parent_h}, full h={n - fixed[n]} for {parent}")
+
+        if a == b:
+            return parent_h
+        if a < b:
+            # E(r) drops by one for a < r <= b
+            old = fixed[b + 1] - fixed[a]
+            new = (
+                (excess[a] <= 0 <= excess[a + 1] - 1)
+                + (above[b] - above[a + 1] if b > a + 1 else 0)
+                + (excess[b] - 1 <= 0 <= excess[b + 1])
+            )
+        else:
+            # E(r) grows by one for b < r <= a
+            old = fixed[a + 1] - fixed[b]
+            new = (
+                (excess[b] <= 0 <= excess[b + 1] + 1)
+                + (below[a] - below[b + 1] if a > b + 1 else 0)
+                + (excess[a] + 1 <= 0 <= excess[a + 1])
+            )
+        return parent_h + old - new
@@ -1,5 +1,7 @@
 import pygame
 import math
+import os
+import sys
 
 from typing import Any
 
@@ -7,6 +9,20 @@ from hlogedu.search.problem import Problem, action, Categorical
 from hlogedu.search.visualizer import SolutionVisualizer
 from hlogedu.search.common import ClassParameter
 
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from maze_layout import (
+    DIRECTIONS,
+    bfs_distances,
+    cell_moves,
+    load_landmarks,
+    load_layout,
+    save_landmarks,
+    select_landmarks,
+)
+
 # Visualization (you do not have to modify this!)
 ##############################################################################
 
@@ -150,25 +166,39 @@ class PacmanProblem(Problem):
             type=str,
             default=None,
             help="File with the maze in the Pacman Project format.",
-        )
+        ),
+        ClassParameter(
+            "landmarks",
+            type=int,
+            default="8",
+            help="Number of landmarks used by the ALT heuristic.",
+        ),
+        ClassParameter(
+            "landmarks_file",
+            type=str,
+            default="",
+            help="File where the ALT landmark tables are loaded from / saved to.",
+        ),
     ]
 
-    def __init__(self, file: str):
-        with open(file) as fh:
-            self.grid = [line.strip() for line in fh]
+    _DIRECTION_INDEX = {name: d for d, (name, _, _) in enumerate(DIRECTIONS)}
+    _ACTIONS = tuple(f"move({name})" for name, _, _ in DIRECTIONS)
+    _OPPOSITE = {"move(U)": "move(D)", "move(D)": "move(U)",
+                 "move(L)": "move(R)", "move(R)": "move(L)"}
 
-        self.rows = len(self.grid)
-        self.cols = len(self.grid[0])
+    def __init__(self, file: str, landmarks: int = 8, landmarks_file: str = ""):
+        self.num_landmarks = landmarks
+        self.landmarks_file = landmarks_file
+        self._landmark_tables = None
+
+        # Bytes-level parse, or the sidecar cache (see load_layout)
+        self.layout = load_layout(file)
 
-        start = None
-        food = None
+        self.rows = self.layout.rows
+        self.cols = self.layout.cols
 
-        for r, row in enumerate(self.grid):
-            for c, ch in enumerate(row):
-                if ch == "P":
-                    start = (r, c)
-                elif ch == ".":
-                    food = (r, c)
+        start = self.layout.start
+        food = self.layout.food
 
         if start is None:
             raise ValueError("Grid must contain 'P' for Pacman start")
@@ -178,6 +208,63 @@ class PacmanProblem(Problem):
         # state = (pacman_position, food_position | None)
         self.start_state = (start, food)
 
+        # Cells are numbered r * cols + c and `walls` is a flat bitmap
+        # (1 = wall). See maze_layout.MazeLayout.
+        self.walls = self.layout.walls
+        # Legal (action, target_pos) pairs per cell, filled on first visit
+        self.neighbours = [None] * (self.rows * self.cols)
+
+    @property
+    def move_table(self):
+        """`move_table[4 * cell + d]`: target cell of direction d, or -1.
+
+        Built on first use (BFS distances, landmarks); `move` and
+        `successors` only look at the walls around the current cell.
+        """
+        return self.layout.move_table
+
+    @property
+    def grid(self):
+        """Rows of the maze as strings (read lazily, used by the visualizer)."""
+        return self.layout.grid
+
+    def distance_field(self, pos):
+        """Wall-aware distance from every cell to `pos` (-1 = unreachable)."""
+        r, c = pos
+        return bfs_distances(self.move_table, r * self.cols + c)
+
+    def landmark_tables(self):
+        """ALT landmarks and their distance tables, computed once per layout.
+
+        If `landmarks_file` is set the tables are read from it when they
+        match this layout and landmark count, and written to it otherwise,
+        so other processes can reuse them.
+        """
+        if self._landmark_tables is not None:
+            return self._landmark_tables
+
+        tables = None
+        if self.landmarks_file:
+            tables = load_landmarks(self.landmarks_file, self.layout, self.num_landmarks)
+
+        if tables is None:
+            (r, c), _ = self.start_state
+            tables = select_landmarks(self.move_table, r * self.cols + c, self.num_landmarks)
+            if self.landmarks_file:
+                save_landmarks(self.landmarks_file, self.layout, *tables, self.num_landmarks)
+
+        self._landmark_tables = tables
+        return tables
+
+    def _legal_moves(self, cell):
+        cols = self.cols
+        legal = tuple(
+            (self._ACTIONS[d], divmod(target, cols))
+            for d, target in cell_moves(self.walls, self.rows, cols, cell)
+        )
+        self.neighbours[cell] = legal
+        return legal
+
     def get_start_states(self):
         return [self.start_state]
 
@@ -191,24 +278,68 @@ class PacmanProblem(Problem):
     @action(Categorical(["U", "D", "L", "R"]), cost=1)
     def move(self, state, direction):
         (r, c), food = state
-        if direction == "U":
-            r -= 1
-        elif direction == "D":
-            r += 1
-        elif direction == "L":
-            c -= 1
-        elif direction == "R":
-            c += 1
-        else:
+        d = self._DIRECTION_INDEX.get(direction)
+        if d is None:
             raise ValueError(f"Unknown action: {direction}")
 
-        new_food = food
-        if (r, c) == food:
-            new_food = None  # food eaten
+        _, dr, dc = DIRECTIONS[d]
+        r, c = r + dr, c + dc
+        if not (0 <= r < self.rows and 0 <= c < self.cols) or self.walls[r * self.cols + c]:
+            return None
 
-        if 0 <= r <= self.rows and 0 <= c <= self.cols and self.grid[r][c] != "%":
-            return ((r, c), new_food)
-        return None
+        pos = (r, c)
+        if pos == food:
+            return (pos, None)  # food eaten
+        return (pos, food)
+
+    def successors(self, state):
+        """Legal ``(action, new_state, cost)`` moves from `state`.
+
+        Fast path for the algorithms in `algorithms/`: it only walks the
+        precomputed legal moves of the current cell instead of trying the
+        four directions of `move`.
+        """
+        (r, c), food = state
+        cell = r * self.cols + c
+        legal = self.neighbours[cell]
+        if legal is None:
+            legal = self._legal_moves(cell)
+        return [
+            (action_name, (pos, None if pos == food else food), 1)
+            for action_name, pos in legal
+        ]
+
+    def goal_states(self):
+        """The single goal state: Pacman standing on the (eaten) food cell."""
+        _, food = self.start_state
+        return [(food, None)]
+
+    def predecessors(self, state):
+        """``(action, previous_state, cost)`` moves that lead into `state`.
+
+        Moves are symmetric, so the previous cells are the neighbours of the
+        current one and the action is the opposite direction. Before the
+        food is eaten Pacman is never on the food cell; after it is eaten he
+        either was already past it or has just stepped on it.
+        """
+        (r, c), food = state
+        cell = r * self.cols + c
+        legal = self.neighbours[cell]
+        if legal is None:
+            legal = self._legal_moves(cell)
+
+        _, start_food = self.start_state
+        result = []
+        for action_name, pos in legal:
+            back = self._OPPOSITE[action_name]
+            if food is not None:
+                if pos != food:
+                    result.append((back, (pos, food), 1))
+                continue
+            result.append((back, (pos, None), 1))
+            if (r, c) == start_food:
+                result.append((back, (pos, start_food), 1))
+        return result
 # Heuristics
 ##############################################################################
 from hlogedu.search.problem import Heuristic
@@ -267,4 +398,73 @@ class EuclideanHeuristic(Heuristic):
         (food_r, food_c) = food_pos
         
         distance = math.sqrt((pac_r - food_r)**2 + (pac_c - food_c)**2)
-        return distance
\ No newline at end of file
+        return distance
+
+@PacmanProblem.heuristic
+class TrueDistanceHeuristic(Heuristic):
+    """
+    Distancia real (con paredes) desde Pacman hasta la comida.
+
+    La comida no se mueve, así que al crear la heurística se hace un único
+    BFS desde la comida sobre todo el laberinto y se guardan las distancias
+    en un array; compute() es una consulta O(1). Es exacta (h = h*), por lo
+    que A* solo expande nodos de caminos óptimos.
+    """
+    NAME = "TrueDistance"
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        _, food = problem.start_state
+        self.cols = problem.cols
+        self.distances = problem.distance_field(food)
+
+    def compute(self, state):
+        (pac_r, pac_c), food_pos = state
+
+        if food_pos is None:
+            return 0
+
+        distance = self.distances[pac_r * self.cols + pac_c]
+        if distance < 0:
+            return float("inf")  # la comida no es alcanzable
+        return distance
+
+@PacmanProblem.heuristic
+class ALTHeuristic(Heuristic):
+    """
+    Heurística ALT (A*, Landmarks, Triangle inequality).
+
+    Para cada landmark L se tienen precalculadas las distancias reales
+    d(L, x) a todas las celdas. Por la desigualdad triangular
+    d(p, food) >= |d(L, p) - d(L, food)|, así que el máximo sobre todos los
+    landmarks es admisible. Sirve aunque la comida cambie de sitio entre
+    consultas: las tablas solo dependen del laberinto. Se combina (máximo)
+    con la distancia Manhattan, que también es admisible.
+    """
+    NAME = "ALT"
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        self.cols = problem.cols
+        _, self.tables = problem.landmark_tables()
+
+    def compute(self, state):
+        (pac_r, pac_c), food_pos = state
+
+        if food_pos is None:
+            return 0
+
+        (food_r, food_c) = food_pos
+        pac = pac_r * self.cols + pac_c
+        food = food_r * self.cols + food_c
+
+        best = abs(pac_r - food_r) + abs(pac_c - food_c)
+        for distances in self.tables:
+            d_pac = distances[pac]
+            d_food = distances[food]
+            if (d_pac < 0) != (d_food < 0):
+                return float("inf")  # componentes distintas: inalcanzable
+            bound = abs(d_pac - d_food)
+            if bound > best:
+                best = bound
+        return best
@@ -0,0 +1,45 @@
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, "algorithms"), os.path.join(ROOT, "problems"),
+             os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+LAYOUTS_DIR = os.path.join(ROOT, "problems", "layouts")
+KIWIS_DIR = os.path.join(ROOT, "problems", "kiwis")
+
+
+def pytest_configure(config):
+    # Keep the layout sidecars of the test run out of ~/.cache. Set here and
+    # not in a fixture: some parametrizations build problems at collection.
+    os.environ["PACMAN_LAYOUT_CACHE"] = tempfile.mkdtemp(prefix="layout-cache-")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(os.environ.pop("PACMAN_LAYOUT_CACHE"), ignore_errors=True)
+
+
+def layout(name):
+    return os.path.join(LAYOUTS_DIR, name)
+
+
+def replay(problem, node):
+    """Cost of the path to `node`, checking that every step is a move that
+    `problem.successors` offers and that it ends in a goal state. The start
+    is not compared: NQueensIR draws a new one on every call."""
+    path = node.path()
+    assert path[0].parent is None
+    cost = 0
+    for previous, current in zip(path, path[1:]):
+        moves = {action: (state, step) for action, state, step in problem.successors(previous.state)}
+        assert current.action in moves, (current.action, previous.state)
+        state, step = moves[current.action]
+        assert state == current.state
+        cost += step
+    assert problem.is_goal_state(path[-1].state)
+    assert cost == node.path_cost
+    return cost
@@ -0,0 +1,29 @@
+import json
+
+import batch
+import bench
+
+QUICK = bench.job("pacman", {"file": "problems/layouts/tinyMaze.lay"}, "graph-astar", "Manhattan")
+# Tree IDS on bigMaze does not finish in any reasonable time
+ENDLESS = bench.job("pacman", {"file": "problems/layouts/bigMaze.lay"}, "tree-ids")
+
+
+def test_run_batch_reports_a_timeout(tmp_path):
+    out = str(tmp_path / "results.jsonl")
+    results = batch.run_batch([QUICK, ENDLESS, QUICK], out, workers=1, timeout=0.5, log=None)
+    assert [r["status"] for r in results] == ["ok", "timeout", "ok"]
+    assert results[0]["cost"] == results[2]["cost"]
+    # The worker survives the timeout and serves the job after it
+    assert results[0]["worker"] == results[2]["worker"]
+    with open(out) as fh:
+        lines = [json.loads(line) for line in fh]
+    assert sorted(r["status"] for r in lines) == ["ok", "ok", "timeout"]
+
+
+def test_main_exit_status(tmp_path):
+    for jobs, status in (([QUICK], 0), ([QUICK, ENDLESS], 1)):
+        matrix = tmp_path / "jobs.json"
+        matrix.write_text(json.dumps(jobs))
+        argv = ["--matrix", str(matrix), "--workers", "1", "--timeout", "0.5",
+                "--out", str(tmp_path / "out.jsonl")]
+        assert batch.main(argv) == status
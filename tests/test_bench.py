@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+import bench
+
+
+def record(name="job", status="ok", time=1.0, rss=1000, expanded=10, cost=5, **extra):
+    result = {field: None for field in bench.RESULT_FIELDS}
+    result.update(id=name, status=status, time=time, peak_rss_kb=rss,
+                  expanded=expanded, cost=cost, length=3, max_fringe=4, **extra)
+    return result
+
+
+def reasons(result, baseline_record):
+    return [reason.split()[0] for _, reason in bench.find_regressions([result], [baseline_record])]
+
+
+def test_find_regressions_thresholds():
+    old = record()
+    assert reasons(record(), old) == []
+    # Tolerances are exclusive: exactly 25% more is still fine
+    assert reasons(record(time=1.25, rss=1250), old) == []
+    assert reasons(record(time=1.26, rss=1251), old) == ["time", "rss"]
+    assert reasons(record(expanded=11), old) == ["expanded"]
+    assert reasons(record(expanded=9), old) == []
+    assert reasons(record(cost=4), old) == ["cost"]
+    assert reasons(record(status="timeout"), old) == ["status"]
+
+
+def test_find_regressions_ignores_small_absolute_slowdowns():
+    # +100% but only 0.02s: below min_time
+    assert reasons(record(time=0.04), record(time=0.02)) == []
+    assert reasons(record(time=0.08), record(time=0.02)) == ["time"]
+
+
+def test_find_regressions_skips_jobs_without_a_usable_baseline():
+    assert bench.find_regressions([record(status="error")], []) == []
+    assert reasons(record(status="error"), record(status="timeout")) == []
+    # A missing RSS reading is not compared
+    assert reasons(record(rss=None), record()) == []
+    assert reasons(record(rss=5000), record(rss=None)) == []
+
+
+def table_record(name, label, cost):
+    return record(name=name, cost=cost, table="t", label=label)
+
+
+README = """# Readme
+
+<!-- bench:t -->
+old table
+<!-- /bench:t -->
+
+Text after.
+"""
+
+
+def test_update_readme_rewrites_the_marked_table(tmp_path):
+    path = tmp_path / "readme.md"
+    path.write_text(README)
+    results = [table_record("a", "**A**", 5), table_record("b", "**B**", 7), record(name="c")]
+    assert bench.update_readme(results, path=str(path)) == ["t"]
+    text = path.read_text()
+    assert "old table" not in text
+    assert text.startswith("# Readme\n\n<!-- bench:t -->\n| Algoritmo |")
+    assert text.endswith("| **B** | 4 | 7 | 3 | 10 | 1.000 | 1.0 |\n<!-- /bench:t -->\n\nText after.\n")
+
+    # Same results: nothing changes and the file is not written again
+    mtime = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(mtime, mtime - 10**9))
+    assert bench.update_readme(results, path=str(path)) == []
+    assert os.stat(path).st_mtime_ns == mtime - 10**9
+
+
+def test_update_readme_skips_tables_without_markers(tmp_path):
+    path = tmp_path / "readme.md"
+    path.write_text(README)
+    results = [record(name="x", table="other", label="X")]
+    assert bench.update_readme(results, path=str(path)) == []
+    assert path.read_text() == README
+    # A begin marker without its end marker counts as missing
+    path.write_text("<!-- bench:other -->\nold\n")
+    assert bench.update_readme(results, path=str(path)) == []
+
+
+def test_update_readme_rejects_duplicated_markers(tmp_path):
+    path = tmp_path / "readme.md"
+    path.write_text(README + README)
+    with pytest.raises(ValueError, match="more than once"):
+        bench.update_readme([table_record("a", "A", 5)], path=str(path))
+    assert path.read_text() == README + README
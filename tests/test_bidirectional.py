@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from conftest import KIWIS_DIR, layout, replay
+
+from astar import GraphAStar
+from bidirectional import BidirectionalSearch
+from kiwis_and_dogs import KiwisAndDogsProblem, ShortestPathHeuristic
+from pacman import ManhattanHeuristic, PacmanProblem
+
+
+@pytest.mark.parametrize("name", ["testMaze.lay", "tinyMaze.lay", "smallMaze.lay",
+                                  "mediumMaze.lay", "openMaze.lay"])
+def test_pacman_cost_is_optimal(name):
+    problem = PacmanProblem(file=layout(name))
+    result = BidirectionalSearch(problem).search()
+    expected = GraphAStar(problem, ManhattanHeuristic(problem)).search()
+    assert replay(problem, result) == expected.path_cost
+
+
+@pytest.mark.parametrize("file", ["", os.path.join(KIWIS_DIR, "grid12.json")])
+@pytest.mark.parametrize("packed", [0, 1])
+def test_kiwis_cost_is_optimal(file, packed):
+    problem = KiwisAndDogsProblem(file=file, packed=packed)
+    result = BidirectionalSearch(problem).search()
+    expected = GraphAStar(problem, ShortestPathHeuristic(problem)).search()
+    assert replay(problem, result) == expected.path_cost
+
+
+def test_counts_both_sides():
+    problem = PacmanProblem(file=layout("mediumMaze.lay"))
+    search = BidirectionalSearch(problem)
+    search.search()
+    assert search.forward_expanded > 0 and search.backward_expanded > 0
+    assert search.expanded_nodes == search.forward_expanded + search.backward_expanded
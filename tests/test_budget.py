@@ -0,0 +1,84 @@
+from conftest import layout
+
+from astar import GraphAStar, TreeAStar
+from budget import BudgetExceeded, SearchBudget
+from ids import TreeIDS
+from idastar import IDAStar
+from nqueens import NQueensIterativeRepair
+from pacman import ManhattanHeuristic, PacmanProblem
+
+
+def pacman(name="smallMaze.lay"):
+    problem = PacmanProblem(file=layout(name))
+    return problem, ManhattanHeuristic(problem)
+
+
+def test_expanded_limit_is_exact():
+    problem, heuristic = pacman()
+    result = TreeAStar(problem, heuristic, budget=SearchBudget(max_expanded=100)).search()
+    assert isinstance(result, BudgetExceeded)
+    assert not result
+    assert result.reason == "expanded"
+    assert result.expanded == 100
+    assert result.algorithm == "TreeAStar"
+    assert result.bound_kind == "f"
+    # Highest f expanded: a lower bound of the optimal cost (19)
+    assert 0 < result.bound <= 19
+    assert result.as_dict()["event"] == "budget_exceeded"
+
+
+def test_fringe_and_time_limits():
+    problem, heuristic = pacman()
+    result = TreeAStar(problem, heuristic,
+                       budget=SearchBudget(max_fringe=5, check_every=1)).search()
+    assert result.reason == "fringe"
+    assert result.fringe >= 5
+
+    result = TreeAStar(problem, heuristic, budget=SearchBudget(max_time=0, check_every=1)).search()
+    assert result.reason == "time"
+    assert result.expanded == 1
+
+
+def test_generous_budget_does_not_change_the_result():
+    problem, heuristic = pacman()
+    plain = TreeAStar(problem, heuristic)
+    expected = plain.search()
+    budgeted = TreeAStar(problem, heuristic, budget=SearchBudget(max_expanded=10 ** 6, max_time=60))
+    result = budgeted.search()
+    assert result.path_cost == expected.path_cost
+    assert budgeted.expanded_nodes == plain.expanded_nodes
+
+
+def test_ids_reports_the_depth_reached():
+    result = TreeIDS(NQueensIterativeRepair(n_queens=6, seed=2),
+                     budget=SearchBudget(max_expanded=500)).search()
+    assert result.reason == "expanded"
+    assert result.bound_kind == "depth"
+    assert result.bound >= 1
+
+
+def test_idastar_reports_the_f_bound():
+    problem, heuristic = pacman()
+    result = IDAStar(problem, heuristic, budget=SearchBudget(max_expanded=200)).search()
+    assert result.reason == "expanded"
+    assert result.bound_kind == "f"
+    assert result.bound <= 19
+
+
+def test_ids_without_successors_stops_on_time(tmp_path):
+    # No move from the start: each iteration expands nothing, so only the
+    # per-iteration check can stop the deepening
+    path = tmp_path / "walled.lay"
+    path.write_text("%%%%%%\n%P%%.%\n%%%%%%\n")
+    result = TreeIDS(PacmanProblem(file=str(path)), budget=SearchBudget(max_time=0.05)).search()
+    assert result.reason == "time"
+    assert result.expanded == 0
+
+
+def test_graph_astar_generated_counts_the_root():
+    problem, heuristic = pacman("testMaze.lay")
+    result = GraphAStar(problem, heuristic, budget=SearchBudget(max_expanded=2)).search()
+    # The budget stops the search once the second expansion is done. In the
+    # testMaze corridor each of the two expansions adds one child, and A*
+    # counts the root as generated too
+    assert (result.expanded, result.generated) == (2, 3)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from conftest import layout
+
+from astar import GraphAStar, TreeAStar
+from budget import BudgetExceeded, SearchBudget
+from checkpoint import Checkpointer
+from ids import TreeIDS
+from idastar import IDAStar
+from nqueens import NQueensIterativeRepair
+from pacman import ManhattanHeuristic, PacmanProblem
+
+
+def pacman():
+    problem = PacmanProblem(file=layout("smallMaze.lay"))
+    return problem, ManhattanHeuristic(problem)
+
+
+def nqueens():
+    return NQueensIterativeRepair(n_queens=5, seed=2), None
+
+
+# name -> (problem and heuristic factory, search factory)
+SEARCHES = {
+    "tree-astar": (pacman, lambda p, h, **kw: TreeAStar(p, h, **kw)),
+    "tree-astar-pooled": (pacman, lambda p, h, **kw: TreeAStar(p, h, node_pool=True, **kw)),
+    "ida-star": (pacman, lambda p, h, **kw: IDAStar(p, h, **kw)),
+    "tree-ids": (nqueens, lambda p, h, **kw: TreeIDS(p, **kw)),
+    "tree-ids-fast": (nqueens, lambda p, h, **kw: TreeIDS(p, fast=True, **kw)),
+}
+
+
+def build(name, **kwargs):
+    make_problem, make_search = SEARCHES[name]
+    return make_search(*make_problem(), **kwargs)
+
+
+def summary(search, node):
+    path = node.path()
+    return ([n.action for n in path], [n.expanded_order for n in path],
+            node.path_cost, search.expanded_nodes)
+
+
+@pytest.mark.parametrize("name", sorted(SEARCHES))
+def test_resume_matches_uninterrupted_run(name, tmp_path):
+    plain = build(name)
+    expected = summary(plain, plain.search())
+    stop = expected[-1] // 2
+
+    path = str(tmp_path / "search.ckpt")
+    interrupted = build(name, checkpoint=Checkpointer(path, every=max(1, stop // 3)),
+                        budget=SearchBudget(max_expanded=stop))
+    assert isinstance(interrupted.search(), BudgetExceeded)
+    assert os.path.exists(path)
+
+    checkpoint = Checkpointer(path, every=max(1, stop // 3))
+    resumed = build(name, checkpoint=checkpoint)
+    assert summary(resumed, resumed.search()) == expected
+    assert not os.path.exists(path)
+
+
+def test_snapshot_of_another_mode_is_rejected(tmp_path):
+    path = str(tmp_path / "search.ckpt")
+    build("tree-ids-fast", checkpoint=Checkpointer(path, every=10),
+          budget=SearchBudget(max_expanded=200)).search()
+    assert os.path.exists(path)
+    with pytest.raises(ValueError):
+        build("tree-ids", checkpoint=Checkpointer(path)).search()
+
+
+def test_graph_astar_refuses_a_checkpoint(tmp_path):
+    problem, heuristic = pacman()
+    search = GraphAStar(problem, heuristic, checkpoint=Checkpointer(str(tmp_path / "x")))
+    with pytest.raises(ValueError):
+        search.search()
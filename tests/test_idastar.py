@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import layout, replay
+
+from astar import GraphAStar
+from ids import TreeIDS
+from idastar import IDAStar
+from kiwis_and_dogs import KiwisAndDogsProblem, ShortestPathHeuristic
+from nqueens import NQueensIterativeRepair
+from pacman import ManhattanHeuristic, PacmanProblem
+
+
+@pytest.mark.parametrize("name", ["testMaze.lay", "tinyMaze.lay", "smallMaze.lay", "contoursMaze.lay"])
+def test_pacman_cost_is_optimal(name):
+    problem = PacmanProblem(file=layout(name))
+    result = IDAStar(problem, ManhattanHeuristic(problem)).search()
+    expected = GraphAStar(problem, ManhattanHeuristic(problem)).search()
+    assert replay(problem, result) == expected.path_cost
+
+
+@pytest.mark.parametrize("packed", [0, 1])
+def test_kiwis_cost_is_optimal(packed):
+    # Non-unit edge costs: the bound jumps to the smallest pruned f
+    problem = KiwisAndDogsProblem(packed=packed)
+    result = IDAStar(problem, ShortestPathHeuristic(problem)).search()
+    expected = GraphAStar(problem, ShortestPathHeuristic(problem)).search()
+    assert replay(problem, result) == expected.path_cost
+
+
+@pytest.mark.parametrize("n_queens, seed", [(4, 123), (4, 1), (5, 7)])
+def test_zero_heuristic_matches_ids(n_queens, seed):
+    problem = NQueensIterativeRepair(n_queens=n_queens, seed=seed)
+    result = IDAStar(problem, lambda state: 0).search()
+    expected = TreeIDS(NQueensIterativeRepair(n_queens=n_queens, seed=seed)).search()
+    assert replay(problem, result) == expected.path_cost
+
+
+def test_start_state_is_fetched_once():
+    # NQueensIR draws a new random board on every get_start_states() call
+    problem = NQueensIterativeRepair(n_queens=5, seed=7)
+    calls = []
+    get_start_states = problem.get_start_states
+    problem.get_start_states = lambda: calls.append(1) or get_start_states()
+    IDAStar(problem, lambda state: 0).search()
+    assert len(calls) == 1
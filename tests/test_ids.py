@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from conftest import layout, replay
+
+from budget import BudgetExceeded, SearchBudget
+from checkpoint import Checkpointer
+from ids import TreeIDS
+from nqueens import NQueensIterativeRepair
+from pacman import PacmanProblem
+
+PROBLEMS = {
+    "nqueens-4-123": lambda: NQueensIterativeRepair(n_queens=4, seed=123),
+    "nqueens-5-2": lambda: NQueensIterativeRepair(n_queens=5, seed=2),
+    "tinyMaze": lambda: PacmanProblem(file=layout("tinyMaze.lay")),
+    "testMaze": lambda: PacmanProblem(file=layout("testMaze.lay")),
+}
+
+
+def summary(search, node):
+    path = node.path()
+    return ([n.state for n in path], [n.action for n in path],
+            [n.expanded_order for n in path], node.path_cost, search.expanded_nodes)
+
+
+@pytest.mark.parametrize("name", sorted(PROBLEMS))
+@pytest.mark.parametrize("cache_limit", [100000, 5, 0])
+def test_fast_matches_classic(name, cache_limit):
+    classic = TreeIDS(PROBLEMS[name]())
+    expected = summary(classic, classic.search())
+
+    problem = PROBLEMS[name]()
+    fast = TreeIDS(problem, fast=True, cache_limit=cache_limit)
+    result = fast.search()
+    assert summary(fast, result) == expected
+    replay(problem, result)
+    assert fast._cache_used <= cache_limit
+
+
+@pytest.mark.parametrize("name", sorted(PROBLEMS))
+def test_fast_resume_with_small_cache_matches_classic(name, tmp_path):
+    classic = TreeIDS(PROBLEMS[name]())
+    expected = summary(classic, classic.search())
+    stop = expected[-1] // 2
+
+    # The restored path stack re-reads successor lists the cache evicted
+    path = str(tmp_path / "ids.ckpt")
+    interrupted = TreeIDS(PROBLEMS[name](), fast=True, cache_limit=5,
+                          checkpoint=Checkpointer(path, every=max(1, stop // 3)),
+                          budget=SearchBudget(max_expanded=stop))
+    assert isinstance(interrupted.search(), BudgetExceeded)
+    assert os.path.exists(path)
+
+    resumed = TreeIDS(PROBLEMS[name](), fast=True, cache_limit=5,
+                      checkpoint=Checkpointer(path))
+    assert summary(resumed, resumed.search()) == expected
@@ -0,0 +1,26 @@
+import pytest
+
+from conftest import layout
+
+from astar import GraphAStar, TreeAStar
+from ids import TreeIDS
+from instrumentation import SearchStats, instrumented
+from pacman import ManhattanHeuristic, PacmanProblem
+
+
+@pytest.mark.parametrize("algorithm", [TreeAStar, GraphAStar])
+def test_astar_counter_matches_the_nodes_built(algorithm):
+    problem = PacmanProblem(file=layout("tinyMaze.lay"))
+    search = algorithm(problem, ManhattanHeuristic(problem))
+    stats = SearchStats()
+    with instrumented(search, stats):
+        search.search()
+    # Both counts include the root
+    assert stats.generated == search._generated_count
+
+
+def test_ids_generated_counts_a_root_per_iteration():
+    problem = PacmanProblem(file=layout("tinyMaze.lay"))
+    result, stats = TreeIDS(problem).search_with_stats()
+    # One root per depth limit 0..depth plus every child (expanded_nodes)
+    assert stats.generated == stats.expanded + len(result.path())
@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import layout, replay
+
+from astar import GraphAStar
+from jps import JumpPointSearch
+from pacman import ManhattanHeuristic, PacmanProblem
+
+LAYOUTS = [
+    "testMaze.lay", "tinyMaze.lay", "smallMaze.lay", "mediumMaze.lay",
+    "bigMaze.lay", "openMaze.lay", "contoursMaze.lay", "wc3/tranquilpaths.lay",
+]
+
+
+@pytest.mark.parametrize("name", LAYOUTS)
+def test_cost_is_optimal_and_path_valid(name):
+    problem = PacmanProblem(file=layout(name))
+    result = JumpPointSearch(problem).search()
+    expected = GraphAStar(problem, ManhattanHeuristic(problem)).search()
+    assert replay(problem, result) == expected.path_cost
+    assert len(result.path()) == expected.path_cost + 1
+
+
+def test_compare_astar_counts_graph_astar_expansions():
+    problem = PacmanProblem(file=layout("mediumMaze.lay"))
+    search = JumpPointSearch(problem, compare_astar=True)
+    search.search()
+    astar = GraphAStar(problem, ManhattanHeuristic(problem))
+    astar.search()
+    assert search.astar_expanded_nodes == astar.expanded_nodes
+    assert search.expanded_nodes < astar.expanded_nodes
+
+
+def test_unreachable_food(tmp_path):
+    path = tmp_path / "walled.lay"
+    path.write_text("%%%%%%\n%P%%.%\n%%%%%%\n")
+    problem = PacmanProblem(file=str(path))
+    assert JumpPointSearch(problem).search() is None
+    assert GraphAStar(problem, ManhattanHeuristic(problem)).search() is None
+
+
+def test_generated_counts_the_root(tmp_path):
+    path = tmp_path / "walled.lay"
+    path.write_text("%%%%%%\n%P%%.%\n%%%%%%\n")
+    problem = PacmanProblem(file=str(path))
+    search = JumpPointSearch(problem)
+    astar = GraphAStar(problem, ManhattanHeuristic(problem))
+    search.search()
+    astar.search()
+    # Only the root was generated, as in A*
+    assert search._generated_count == astar._generated_count == 1
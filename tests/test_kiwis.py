@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from conftest import KIWIS_DIR
+
+from kiwis_and_dogs import KiwisAndDogsProblem, ShortestPathHeuristic, State
+
+INSTANCES = ["", os.path.join(KIWIS_DIR, "grid12.json")]
+
+
+def all_reachable(problem):
+    """Every state reachable from the start, breadth first."""
+    start = problem.get_start_states()[0]
+    seen, queue = {start}, [start]
+    for state in queue:
+        for _, child, _ in problem.successors(state):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    return queue
+
+
+def check_conditions(state, conditions):
+    """The precondition test of the hand-written actions of the first version."""
+    for condition in (c.strip() for c in conditions.split(",") if c.strip()):
+        if condition.startswith("somebody("):
+            vertex = condition[9:-1]
+            if vertex not in state.kiwis and vertex not in state.dogs:
+                return False
+        elif condition.startswith("nobody("):
+            vertex = condition[7:-1]
+            if vertex in state.kiwis or vertex in state.dogs:
+                return False
+    return True
+
+
+def reference_moves(problem, state):
+    """Moves of `state` straight from the edge table and the string conditions."""
+    moves = set()
+    for (u, v), (cost, conditions) in problem.graph.items():
+        if not check_conditions(state, conditions):
+            continue
+        for idx, pos in enumerate(state.kiwis):
+            if pos == u:
+                kiwis = state.kiwis[:idx] + (v,) + state.kiwis[idx + 1:]
+                moves.add((f"move_kiwi({u}_to_{v}, {idx})", State(kiwis, state.dogs), cost))
+        for idx, pos in enumerate(state.dogs):
+            if pos == u:
+                dogs = state.dogs[:idx] + (v,) + state.dogs[idx + 1:]
+                moves.add((f"move_dog({u}_to_{v}, {idx})", State(state.kiwis, dogs), cost))
+    return moves
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+@pytest.mark.parametrize("packed", [0, 1])
+def test_successors_match_the_generated_actions(file, packed):
+    problem = KiwisAndDogsProblem(file=file, packed=packed)
+    for state in all_reachable(problem):
+        fast = problem.successors(state)
+        generic = [(action, child, cost) for child, action, cost in problem.get_successors(state)]
+        assert len(set(fast)) == len(fast)
+        if not packed:
+            assert sorted(fast) == sorted(generic), state
+            continue
+        # Packed: of several agents of one kind on a vertex only the first
+        # is moved, since they lead to the same canonical state
+        assert set(fast) <= set(generic), state
+        assert {(child, cost) for _, child, cost in fast} \
+            == {(child, cost) for _, child, cost in generic}, state
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+def test_compiled_conditions_match_the_string_conditions(file):
+    problem = KiwisAndDogsProblem(file=file)
+    for state in all_reachable(problem):
+        assert set(problem.successors(state)) == reference_moves(problem, state), state
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+@pytest.mark.parametrize("packed", [0, 1])
+def test_shortest_path_heuristic_is_consistent(file, packed):
+    problem = KiwisAndDogsProblem(file=file, packed=packed)
+    h = ShortestPathHeuristic(problem)
+    assert h(problem.goal_state) == 0
+    for state in all_reachable(problem):
+        h_state = h(state)
+        for _, child, cost in problem.successors(state):
+            assert h_state <= cost + h(child), (state, child)
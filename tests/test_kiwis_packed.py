@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from conftest import KIWIS_DIR
+
+from astar import GraphAStar
+from kiwis_and_dogs import KiwisAndDogsProblem, ShortestPathHeuristic
+from progress import ProgressReporter
+
+INSTANCES = ["", os.path.join(KIWIS_DIR, "grid12.json")]
+
+
+def reachable(problem, limit=300):
+    """First `limit` states reachable from the start, breadth first."""
+    start = problem.get_start_states()[0]
+    seen, queue = {start}, [start]
+    for state in queue:
+        if len(seen) >= limit:
+            break
+        for _, child, _ in problem.successors(state):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    return queue
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+def test_pack_round_trip(file):
+    problem = KiwisAndDogsProblem(file=file)
+    packed = KiwisAndDogsProblem(file=file, packed=1)
+    assert packed.get_start_states()[0] == packed.pack(problem.get_start_states()[0])
+    assert packed.goal_states() == [packed.pack(problem.goal_state)]
+    for state in reachable(problem):
+        canonical = packed.unpack(packed.pack(state))
+        assert sorted(canonical.kiwis) == sorted(state.kiwis)
+        assert sorted(canonical.dogs) == sorted(state.dogs)
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+def test_moves_agree(file):
+    problem = KiwisAndDogsProblem(file=file)
+    packed = KiwisAndDogsProblem(file=file, packed=1)
+    for state in reachable(problem):
+        code = packed.pack(state)
+        for expand in ("successors", "predecessors"):
+            expected = {(packed.pack(s), cost) for _, s, cost in getattr(problem, expand)(state)}
+            found = {(s, cost) for _, s, cost in getattr(packed, expand)(code)}
+            assert found == expected, (expand, state)
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+def test_backward_labels_are_forward_moves(file):
+    packed = KiwisAndDogsProblem(file=file, packed=1)
+    for code in reachable(packed):
+        for action, previous, cost in packed.predecessors(code):
+            forward = {a: (s, c) for a, s, c in packed.successors(previous)}
+            assert forward.get(action) == (code, cost), (action, packed.unpack(previous))
+
+
+@pytest.mark.parametrize("file", INSTANCES)
+def test_optimal_costs_agree(file):
+    results = []
+    for packed in (0, 1):
+        problem = KiwisAndDogsProblem(file=file, packed=packed)
+        # One progress event per expansion, with the f of the expanded node
+        events = []
+        progress = ProgressReporter(events.append, every=1, interval=None)
+        search = GraphAStar(problem, ShortestPathHeuristic(problem), progress=progress)
+        cost = search.search().path_cost
+        results.append((cost, search.expanded_nodes, sum(event["bound"] < cost for event in events)))
+    (cost, expanded, below), (packed_cost, packed_expanded, packed_below) = results
+    assert packed_cost == cost
+    # Fewer states in total, and also below the optimal cost, where the
+    # expansions do not depend on tie-breaks
+    assert packed_expanded <= expanded
+    assert packed_below <= below
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from conftest import layout
+
+from maze_layout import load_landmarks, save_landmarks, select_landmarks
+from pacman import ALTHeuristic, PacmanProblem, TrueDistanceHeuristic
+
+
+@pytest.mark.parametrize("name", ["tinyMaze.lay", "mediumMaze.lay", "bigMaze.lay",
+                                  "openMaze.lay", "wc3/tranquilpaths.lay"])
+@pytest.mark.parametrize("landmarks", [1, 8])
+def test_alt_never_exceeds_true_distance(name, landmarks):
+    problem = PacmanProblem(file=layout(name), landmarks=landmarks)
+    alt, true = ALTHeuristic(problem), TrueDistanceHeuristic(problem)
+    _, food = problem.start_state
+    for r in range(problem.rows):
+        for c in range(problem.cols):
+            if not problem.walls[r * problem.cols + c]:
+                state = ((r, c), food)
+                assert alt(state) <= true(state), (r, c)
+    assert alt(problem.start_state) > 0
+
+
+def test_landmark_file_round_trip(tmp_path):
+    path = str(tmp_path / "medium.alt")
+    first = PacmanProblem(file=layout("mediumMaze.lay"), landmarks=4, landmarks_file=path)
+    landmarks, tables = first.landmark_tables()
+    assert os.path.exists(path)
+
+    # A second problem reads the same tables instead of running the BFSs
+    second = PacmanProblem(file=layout("mediumMaze.lay"), landmarks=4, landmarks_file=path)
+    loaded = load_landmarks(path, second.layout, 4)
+    assert loaded is not None
+    assert loaded[0] == landmarks
+    assert [list(t) for t in loaded[1]] == [list(t) for t in tables]
+    assert second.landmark_tables()[0] == landmarks
+
+
+def test_landmark_file_of_another_layout_or_count_is_rejected(tmp_path):
+    path = str(tmp_path / "medium.alt")
+    medium = PacmanProblem(file=layout("mediumMaze.lay"), landmarks=4, landmarks_file=path)
+    medium.landmark_tables()
+
+    big = PacmanProblem(file=layout("bigMaze.lay"))
+    assert load_landmarks(path, big.layout, 4) is None
+    assert load_landmarks(path, medium.layout, 3) is None
+
+    # Another count recomputes and replaces the file
+    three = PacmanProblem(file=layout("mediumMaze.lay"), landmarks=3, landmarks_file=path)
+    assert len(three.landmark_tables()[0]) == 3
+    assert load_landmarks(path, three.layout, 3) is not None
+    assert load_landmarks(path, three.layout, 4) is None
+
+
+def test_truncated_landmark_file_is_rejected(tmp_path):
+    problem = PacmanProblem(file=layout("tinyMaze.lay"))
+    (r, c), _ = problem.start_state
+    landmarks, tables = select_landmarks(problem.move_table, r * problem.cols + c, 2)
+    path = str(tmp_path / "tiny.alt")
+    save_landmarks(path, problem.layout, landmarks, tables, 2)
+    with open(path, "rb") as fh:
+        data = fh.read()
+    with open(path, "wb") as fh:
+        fh.write(data[:-4])
+    assert load_landmarks(path, problem.layout, 2) is None
@@ -0,0 +1,141 @@
+import glob
+import os
+import struct
+
+import pytest
+
+from conftest import LAYOUTS_DIR, layout
+
+import maze_layout
+from maze_layout import CACHE_ENV, load_layout, parse_layout
+
+LAYOUT_FILES = sorted(glob.glob(os.path.join(LAYOUTS_DIR, "**", "*.lay"), recursive=True))
+
+
+def original_loader(path):
+    """The per-character scan PacmanProblem used before `parse_layout`."""
+    with open(path, encoding="latin-1") as fh:
+        grid = [line.strip() for line in fh]
+    rows, cols = len(grid), len(grid[0])
+    start = food = None
+    for r, row in enumerate(grid):
+        for c, ch in enumerate(row):
+            if ch == "P":
+                start = (r, c)
+            elif ch == ".":
+                food = (r, c)
+    to_wall = bytes(1 if ch == ord("%") else 0 for ch in range(256))
+    walls = bytearray()
+    for row in grid:
+        line = row[:cols].encode("latin-1").translate(to_wall)
+        walls += line
+        walls += b"\x01" * (cols - len(line))
+    return rows, cols, start, food, walls
+
+
+@pytest.mark.parametrize("path", LAYOUT_FILES,
+                         ids=[os.path.relpath(p, LAYOUTS_DIR) for p in LAYOUT_FILES])
+def test_parse_matches_original_loader(path):
+    parsed = parse_layout(path)
+    assert (parsed.rows, parsed.cols, parsed.start, parsed.food, parsed.walls) \
+        == original_loader(path)
+
+
+@pytest.fixture
+def maze(tmp_path):
+    path = tmp_path / "maze.lay"
+    with open(layout("tinyMaze.lay"), "rb") as fh:
+        path.write_bytes(fh.read())
+    return str(path)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Paths parsed from the text, i.e. not served by the sidecar."""
+    calls = []
+
+    def counting(path):
+        calls.append(path)
+        return parse_layout(path)
+
+    monkeypatch.setattr(maze_layout, "parse_layout", counting)
+    return calls
+
+
+def same_layout(a, b):
+    return (a.rows, a.cols, a.start, a.food, a.walls) == (b.rows, b.cols, b.start, b.food, b.walls)
+
+
+def sidecars(cache_dir):
+    return glob.glob(os.path.join(str(cache_dir), "*.bin"))
+
+
+def test_cache_is_on_by_default(maze, parses, tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    monkeypatch.setattr(maze_layout, "DEFAULT_CACHE_DIR", str(tmp_path / "default-cache"))
+    load_layout(maze)
+    load_layout(maze)
+    assert len(parses) == 1
+    assert len(sidecars(tmp_path / "default-cache")) == 1
+
+    # The variable moves it; cache_dir=False skips it
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "env-cache"))
+    load_layout(maze)
+    assert len(sidecars(tmp_path / "env-cache")) == 1
+    load_layout(maze, cache_dir=False)
+    assert len(parses) == 3
+
+
+def test_empty_variable_turns_the_cache_off(maze, parses, tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, "")
+    monkeypatch.setattr(maze_layout, "DEFAULT_CACHE_DIR", str(tmp_path / "default-cache"))
+    load_layout(maze)
+    load_layout(maze)
+    assert len(parses) == 2
+    assert not os.path.exists(tmp_path / "default-cache")
+
+
+def test_second_load_reads_the_sidecar(maze, parses, tmp_path):
+    cache = str(tmp_path / "cache")
+    first = load_layout(maze, cache_dir=cache)
+    second = load_layout(maze, cache_dir=cache)
+    assert len(parses) == 1
+    assert same_layout(first, second)
+
+
+def test_changed_mtime_invalidates_the_sidecar(maze, parses, tmp_path):
+    cache = str(tmp_path / "cache")
+    load_layout(maze, cache_dir=cache)
+    st = os.stat(maze)
+    os.utime(maze, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    load_layout(maze, cache_dir=cache)
+    load_layout(maze, cache_dir=cache)
+    assert len(parses) == 2
+
+
+def test_changed_size_invalidates_the_sidecar(maze, parses, tmp_path):
+    cache = str(tmp_path / "cache")
+    load_layout(maze, cache_dir=cache)
+    st = os.stat(maze)
+    with open(maze, "ab") as fh:
+        fh.write(b"%%%%%%%%%%\n")
+    # Same mtime: only the size tells the edit apart
+    os.utime(maze, ns=(st.st_atime_ns, st.st_mtime_ns))
+    reloaded = load_layout(maze, cache_dir=cache)
+    assert len(parses) == 2
+    assert reloaded.rows == parse_layout(maze).rows
+
+
+def test_sidecar_of_another_format_version_is_ignored(maze, parses, tmp_path):
+    cache = tmp_path / "cache"
+    load_layout(maze, cache_dir=str(cache))
+    (sidecar,) = sidecars(cache)
+    with open(sidecar, "r+b") as fh:
+        fh.seek(4)  # after the magic
+        fh.write(struct.pack("<H", maze_layout._VERSION + 1))
+    reloaded = load_layout(maze, cache_dir=str(cache))
+    assert len(parses) == 2
+    assert same_layout(reloaded, parse_layout(maze))
+    # ... and rewritten in the current version
+    load_layout(maze, cache_dir=str(cache))
+    assert len(parses) == 2
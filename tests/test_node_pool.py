@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import layout
+
+from astar import GraphAStar, TreeAStar
+from node import Node, NodePool
+from nqueens import NQueensIterativeRepair, RepairHeuristic
+from pacman import EuclideanHeuristic, ManhattanHeuristic, PacmanProblem
+
+
+def describe(node):
+    return [(n.state, n.action, n.path_cost, n.depth, n.expanded_order, n.location)
+            for n in node.path()]
+
+
+def pacman(name, heuristic_class):
+    problem = PacmanProblem(file=layout(name))
+    return problem, heuristic_class(problem)
+
+
+def nqueens():
+    problem = NQueensIterativeRepair(n=5, seed=7)
+    return problem, RepairHeuristic(problem)
+
+
+CASES = {
+    "tinyMaze-manhattan": lambda: pacman("tinyMaze.lay", ManhattanHeuristic),
+    "smallMaze-manhattan": lambda: pacman("smallMaze.lay", ManhattanHeuristic),
+    "smallMaze-euclidean": lambda: pacman("smallMaze.lay", EuclideanHeuristic),
+    "nqueens-5-7": nqueens,
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_pooled_search_matches_the_node_search(case):
+    runs = []
+    for node_pool in (False, True):
+        problem, heuristic = CASES[case]()
+        search = TreeAStar(problem, heuristic, node_pool=node_pool)
+        goal = search.search()
+        runs.append((describe(goal), goal.path_cost, search.expanded_nodes,
+                     search._generated_count, search.max_fringe_size))
+    assert runs[0] == runs[1]
+
+
+def test_pool_node_matches_the_node_chain():
+    pool = NodePool()
+    nodes = [Node("s0")]
+    nodes[0].location = "root"
+    indices = [pool.add("s0")]
+    # (parent, action, cost): a small tree, with a float cost halfway
+    for i, (parent, action, cost) in enumerate(
+            [(0, "a", 1), (0, "b", 2), (1, "a", 1), (3, "c", 0.5), (2, "a", 3)], 1):
+        node = Node(f"s{i}", nodes[parent], action, nodes[parent].path_cost + cost)
+        node.expanded_order = parent
+        node.set_location(parent)
+        nodes.append(node)
+        indices.append(pool.add(f"s{i}", indices[parent], action, node.path_cost,
+                                expanded_order=parent, location=parent))
+
+    assert len(pool) == len(nodes)
+    assert pool.path_cost.typecode == "d"
+    for index, node in zip(indices, nodes):
+        assert describe(pool.node(index)) == describe(node)
+        assert pool.get_action(index) == node.action
+
+
+def test_graph_astar_refuses_a_node_pool():
+    problem, heuristic = pacman("tinyMaze.lay", ManhattanHeuristic)
+    with pytest.raises(ValueError):
+        GraphAStar(problem, heuristic, node_pool=True).search()
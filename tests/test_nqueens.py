@@ -0,0 +1,92 @@
+import pytest
+
+from astar import GraphAStar
+from nqueens import (CROSS_CHECK_ENV, Board, HeuristicMismatch, NQueensIterativeRepair,
+                     RepairHeuristic)
+
+BOARDS = [(4, 123), (6, 1), (8, 5)]
+
+
+def full(heuristic, state):
+    """h of `state` computed from scratch (a bare tuple has no parent)."""
+    return heuristic.compute(tuple(state))
+
+
+@pytest.mark.parametrize("n_queens, seed", BOARDS)
+def test_incremental_matches_full_along_a_search(n_queens, seed):
+    problem = NQueensIterativeRepair(n_queens=n_queens, seed=seed)
+    heuristic = RepairHeuristic(problem, cross_check=False)
+    pairs = []
+
+    def recording(state):
+        h = heuristic(state)
+        pairs.append((h, full(heuristic, state)))
+        return h
+
+    assert GraphAStar(problem, recording).search() is not None
+    assert len(pairs) > 1
+    assert all(h == expected for h, expected in pairs)
+
+
+@pytest.mark.parametrize("n_queens, seed", BOARDS)
+def test_cross_checked_search_runs_clean(n_queens, seed):
+    problem = NQueensIterativeRepair(n_queens=n_queens, seed=seed)
+    assert GraphAStar(problem, RepairHeuristic(problem, cross_check=True)).search() is not None
+
+
+@pytest.mark.parametrize("n_queens, seed", BOARDS)
+def test_explicit_parent_matches_full(n_queens, seed):
+    problem = NQueensIterativeRepair(n_queens=n_queens, seed=seed)
+    heuristic = RepairHeuristic(problem, cross_check=True)
+    parent = tuple(problem.get_start_states()[0])
+    parent_h = full(heuristic, parent)
+    for _, child, _ in problem.successors(Board(parent)):
+        child = tuple(child)
+        assert heuristic.compute(child, parent=parent, parent_h=parent_h) == full(heuristic, child)
+        assert heuristic.compute(child, parent=parent) == full(heuristic, child)
+
+
+def test_corrupted_parent_h_raises():
+    problem = NQueensIterativeRepair(n_queens=6, seed=1)
+    parent = tuple(problem.get_start_states()[0])
+    _, child, _ = problem.successors(Board(parent))[0]
+    wrong_h = RepairHeuristic(problem).compute(parent) + 1
+
+    with pytest.raises(HeuristicMismatch):
+        RepairHeuristic(problem, cross_check=True).compute(
+            tuple(child), parent=parent, parent_h=wrong_h)
+    # Without the check the bad value goes through
+    unchecked = RepairHeuristic(problem, cross_check=False)
+    assert unchecked.compute(tuple(child), parent=parent, parent_h=wrong_h) \
+        == unchecked.compute(tuple(child)) + 1
+
+
+def test_cross_check_defaults_to_the_environment(monkeypatch):
+    problem = NQueensIterativeRepair(n_queens=4)
+    monkeypatch.setenv(CROSS_CHECK_ENV, "1")
+    assert RepairHeuristic(problem).cross_check
+    monkeypatch.setenv(CROSS_CHECK_ENV, "0")
+    assert not RepairHeuristic(problem).cross_check
+
+
+@pytest.mark.parametrize("n_queens, seed", [(4, 123), (5, 7), (6, 1), (8, 5), (10, 3)])
+def test_bulk_successors_match_move_queen(n_queens, seed):
+    problem = NQueensIterativeRepair(n_queens=n_queens, seed=seed)
+    boards = [problem.get_start_states()[0]]
+    # The start board and a few of its children, whose counters come from a parent
+    boards += [child for _, child, _ in problem.successors(boards[0])[::n_queens + 1]]
+    for board in boards:
+        fast = problem.successors(board)
+        generic = problem.get_successors(board)
+        assert len(fast) == len(generic) == n_queens * (n_queens - 1)
+        # (queen_col, new_row) order
+        assert [action for action, _, _ in fast] == [
+            f"move_queen({col}, {row})"
+            for col in range(n_queens) for row in range(n_queens) if row != board[col]
+        ]
+        for (action, child, cost), (expected, expected_action, expected_cost) in zip(fast, generic):
+            assert action == expected_action
+            assert cost == expected_cost
+            assert isinstance(child, Board)
+            assert child == expected
+            assert child.conflicts == expected.conflicts == Board(tuple(child)).conflicts
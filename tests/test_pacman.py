@@ -0,0 +1,72 @@
+import glob
+import os
+
+import pytest
+
+from conftest import LAYOUTS_DIR
+
+from pacman import PacmanProblem
+
+# One of the large wc3 maps too: checking every cell takes about 2s each
+MAZES = sorted(glob.glob(os.path.join(LAYOUTS_DIR, "*.lay"))) \
+    + [os.path.join(LAYOUTS_DIR, "wc3", "battleground.lay")]
+
+# Open cells on the border of the grid and a short row: moves off the grid
+# and into the padding must be rejected without any '%' around them
+UNWALLED = [
+    "P  \n"
+    " % \n"
+    "  .\n",
+
+    ".  %\n"
+    " %\n"
+    "   P\n",
+]
+
+
+def open_states(problem):
+    """Every open cell, with the food still there and already eaten."""
+    _, food = problem.start_state
+    for cell in range(problem.rows * problem.cols):
+        if not problem.walls[cell]:
+            pos = divmod(cell, problem.cols)
+            if pos != food:
+                yield (pos, food)
+            yield (pos, None)
+
+
+def blocked(problem, pos, direction):
+    """Off the grid or into a wall, from the layout text itself."""
+    dr, dc = {"U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)}[direction]
+    r, c = pos[0] + dr, pos[1] + dc
+    if not (0 <= r < problem.rows and 0 <= c < problem.cols):
+        return True
+    row = problem.grid[r]
+    return c >= len(row) or row[c] == "%"
+
+
+def check_against_move(problem):
+    """`successors` against `get_successors`, which tries `move` in every
+    direction and drops the ones it rejects."""
+    for state in open_states(problem):
+        fast = problem.successors(state)
+        generic = [(action, child, cost) for child, action, cost in problem.get_successors(state)]
+        assert fast == generic, state
+        directions = [action[5:-1] for action, _, _ in fast]
+        for direction in "UDLR":
+            assert blocked(problem, state[0], direction) == (direction not in directions)
+
+
+@pytest.mark.parametrize("path", MAZES, ids=[os.path.relpath(p, LAYOUTS_DIR) for p in MAZES])
+def test_successors_match_move_on_the_shipped_mazes(path):
+    check_against_move(PacmanProblem(file=path))
+
+
+@pytest.mark.parametrize("text", UNWALLED, ids=["border", "short-row"])
+def test_successors_match_move_without_surrounding_walls(text, tmp_path):
+    path = tmp_path / "maze.lay"
+    path.write_text(text)
+    problem = PacmanProblem(file=str(path))
+    check_against_move(problem)
+    # Both kinds of edge occur: an open border cell has fewer than four moves
+    assert any(len(problem.successors(s)) < 4 for s in open_states(problem))
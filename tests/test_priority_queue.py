@@ -0,0 +1,125 @@
+import pytest
+
+from conftest import layout
+
+from astar import GraphAStar, TreeAStar
+from kiwis_and_dogs import KiwisAndDogsProblem, ShortestPathHeuristic
+from pacman import EuclideanHeuristic, ManhattanHeuristic, PacmanProblem
+from priority_queue import BucketQueue, HeapQueue, IndexedPriorityQueue
+
+
+class Recorder:
+    """Problem proxy that records the states in the order they are expanded."""
+
+    def __init__(self, problem):
+        self._problem = problem
+        self.expanded = []
+
+    def successors(self, state):
+        self.expanded.append(state)
+        return self._problem.successors(state)
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+
+def test_indexed_decrease_key_reorders():
+    queue = IndexedPriorityQueue()
+    for key, priority in [("a", 5), ("b", 3), ("c", 4)]:
+        queue.push(key, priority, key.upper())
+    queue.decrease_key("a", 1, "A'")
+    assert queue.priority("a") == 1
+    assert [queue.pop() for _ in range(3)] == [(1, "a", "A'"), (3, "b", "B"), (4, "c", "C")]
+    assert not queue
+
+
+def test_indexed_push_keeps_one_entry_per_key():
+    queue = IndexedPriorityQueue()
+    assert queue.push("a", 5, 1)
+    assert queue.push("a", 2, 2)      # lower: decrease-key
+    assert not queue.push("a", 7, 3)  # higher: ignored
+    assert len(queue) == 1
+    assert queue.get("a") == 2
+    assert queue.pop() == (2, "a", 2)
+
+
+def test_indexed_rejects_a_key_increase():
+    queue = IndexedPriorityQueue()
+    queue.push("a", 2, None)
+    with pytest.raises(ValueError):
+        queue.decrease_key("a", 3)
+    assert queue.priority("a") == 2
+
+
+def test_indexed_ties_pop_in_fifo_order():
+    queue = IndexedPriorityQueue()
+    keys = ["k%d" % i for i in range(20)]
+    for count, key in enumerate(keys):
+        queue.push(key, (0, count), None)
+    assert [queue.pop()[1] for _ in keys] == keys
+
+
+def problems():
+    for name in ("tinyMaze.lay", "smallMaze.lay", "mediumMaze.lay", "openMaze.lay"):
+        problem = PacmanProblem(file=layout(name))
+        yield name, problem, ManhattanHeuristic(problem)
+    for packed in (0, 1):
+        problem = KiwisAndDogsProblem(packed=packed)
+        yield "kiwis-%d" % packed, problem, ShortestPathHeuristic(problem)
+
+
+@pytest.mark.parametrize("name, problem, heuristic", list(problems()))
+def test_graph_astar_indexed_matches_heap(name, problem, heuristic):
+    runs = []
+    for indexed in (False, True):
+        recorder = Recorder(problem)
+        result = GraphAStar(recorder, heuristic, indexed_fringe=indexed).search()
+        path = result.path()
+        runs.append((recorder.expanded, [n.action for n in path],
+                     [n.expanded_order for n in path], result.path_cost))
+    assert runs[0] == runs[1]
+
+
+def tree_astar_run(problem, heuristic, bucket_fringe):
+    """Expanded states, fringe classes created and result of a TreeAStar run."""
+    recorder = Recorder(problem)
+    search = TreeAStar(recorder, heuristic, bucket_fringe=bucket_fringe)
+    fringes = []
+
+    def new_fringe(cls, *args):
+        fringes.append(cls)
+        return cls(*args)
+
+    search.new_fringe = new_fringe
+    result = search.search()
+    path = result.path()
+    return (recorder.expanded, [n.expanded_order for n in path], result.path_cost), fringes
+
+
+@pytest.mark.parametrize("name", ["tinyMaze.lay", "smallMaze.lay"])
+@pytest.mark.parametrize("heuristic_class", [ManhattanHeuristic, EuclideanHeuristic])
+def test_tree_astar_fringes_expand_in_the_same_order(name, heuristic_class):
+    problem = PacmanProblem(file=layout(name))
+    heuristic = heuristic_class(problem)
+    auto, auto_fringes = tree_astar_run(problem, heuristic, None)
+    heap, heap_fringes = tree_astar_run(problem, heuristic, False)
+    bucket, bucket_fringes = tree_astar_run(problem, heuristic, True)
+    assert auto == heap == bucket
+    # Integer f keeps the buckets, float f uses the heap from the root
+    expected = BucketQueue if heuristic_class is ManhattanHeuristic else HeapQueue
+    assert (auto_fringes, heap_fringes, bucket_fringes) == ([expected], [HeapQueue], [BucketQueue])
+
+
+def test_tree_astar_moves_to_a_heap_on_the_first_float_f():
+    problem = PacmanProblem(file=layout("smallMaze.lay"))
+    manhattan, euclidean = ManhattanHeuristic(problem), EuclideanHeuristic(problem)
+    start = problem.get_start_states()[0]
+
+    # Integer at the root, float everywhere else
+    def heuristic(state):
+        return manhattan(state) if state == start else euclidean(state)
+
+    auto, auto_fringes = tree_astar_run(problem, heuristic, None)
+    heap, _ = tree_astar_run(problem, heuristic, False)
+    assert auto_fringes == [BucketQueue, HeapQueue]
+    assert auto == heap
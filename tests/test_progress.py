@@ -0,0 +1,130 @@
+import json
+import sys
+
+import pytest
+
+from conftest import layout
+
+import progress
+from astar import GraphAStar
+from pacman import ManhattanHeuristic, PacmanProblem
+from progress import ProgressReporter, current_rss_kb
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(progress.time, "perf_counter", clock)
+    return clock
+
+
+def drive(reporter, clock, until, seconds_per_expansion=0.0):
+    """Call `check` whenever an algorithm would, up to `until` expansions."""
+    reporter.start(object(), "f")
+    calls = []
+    for expanded in range(1, until + 1):
+        clock.now += seconds_per_expansion
+        if expanded >= reporter.next_check:
+            calls.append(expanded)
+            reporter.check(expanded, 7, 3)
+    return calls
+
+
+def test_every_throttles_by_expansions(clock):
+    events = []
+    reporter = ProgressReporter(events.append, every=100, interval=None)
+    calls = drive(reporter, clock, 450, seconds_per_expansion=1.0)
+    # Without an interval the clock is never needed between reports
+    assert calls == [100, 200, 300, 400]
+    assert [e["expanded"] for e in events] == [100, 200, 300, 400]
+    assert reporter.events == 4
+
+
+def test_interval_throttles_by_time(clock):
+    events = []
+    reporter = ProgressReporter(events.append, every=None, interval=5.0, check_every=10)
+    # 0.125s (exact in binary) per expansion: 40 expansions per interval,
+    # seen at the first check after it
+    calls = drive(reporter, clock, 200, seconds_per_expansion=0.125)
+    assert calls == list(range(10, 201, 10))
+    assert [e["expanded"] for e in events] == [40, 80, 120, 160, 200]
+    assert [e["elapsed"] for e in events] == [5.0, 10.0, 15.0, 20.0, 25.0]
+    assert events[0]["nodes_per_second"] == 8.0
+
+
+def test_whichever_comes_first(clock):
+    events = []
+    reporter = ProgressReporter(events.append, every=30, interval=5.0, check_every=10)
+    reporter.start(object(), "depth")
+    reporter.check(10, 1, 0)  # neither
+    clock.now += 5.0
+    reporter.check(20, 1, 0)  # interval
+    reporter.check(30, 1, 0)  # not yet: both restarted at 20
+    reporter.check(50, 2, 0)  # every
+    assert [e["expanded"] for e in events] == [20, 50]
+    assert events[0]["bound_kind"] == "depth"
+    assert reporter.next_check == 60
+
+
+def test_event_fields(clock, tmp_path):
+    events = []
+    path = tmp_path / "progress.jsonl"
+    reporter = ProgressReporter(events.append, path=str(path), every=1, interval=None,
+                                label="run")
+    reporter.start(GraphAStar.__new__(GraphAStar), "f")
+    clock.now += 2.0
+    reporter.check(1, 9, 4)
+    (event,) = events
+    assert json.loads(path.read_text()) == event
+    rss = event.pop("rss_kb")
+    assert event == {
+        "event": "progress", "label": "run", "algorithm": "GraphAStar",
+        "bound_kind": "f", "bound": 9, "expanded": 1, "fringe": 4,
+        "elapsed": 2.0, "nodes_per_second": 0.5,
+    }
+    assert isinstance(rss, int) and rss > 0
+
+
+def test_rss_follows_allocations():
+    before = current_rss_kb()
+    block = b"x" * (64 << 20)
+    after = current_rss_kb()
+    assert after - before >= 32 << 10
+    del block
+
+
+@pytest.mark.skipif(progress.resource is None or sys.platform == "darwin",
+                    reason="ru_maxrss in KiB only on Linux")
+def test_rss_falls_back_to_peak_rss(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+
+    monkeypatch.setattr(progress, "open", no_proc, raising=False)
+    peak = progress.resource.getrusage(progress.resource.RUSAGE_SELF).ru_maxrss
+    # The peak can only grow between the two readings
+    assert current_rss_kb() >= peak
+
+
+def test_misuse():
+    with pytest.raises(ValueError):
+        ProgressReporter(every=None, interval=None)
+    with pytest.raises(RuntimeError):
+        ProgressReporter(every=1).check(1, 0, 0)
+
+
+def test_search_reports_every_n_expansions():
+    events = []
+    problem = PacmanProblem(file=layout("mediumMaze.lay"))
+    search = GraphAStar(problem, ManhattanHeuristic(problem),
+                        progress=ProgressReporter(events.append, every=50, interval=None))
+    search.search()
+    assert [e["expanded"] for e in events] == list(range(50, search.expanded_nodes + 1, 50))
+    assert all(e["algorithm"] == "GraphAStar" and e["bound_kind"] == "f" for e in events)